@@ -3,7 +3,12 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, Query, Request, Security, status
 
 from schemas.auth import AuthData
-from schemas.user import UserAdminView, UserCreate, UserListAdminView
+from schemas.user import (
+    UserAdminView,
+    UserCreate,
+    UserListAdminView,
+    UsersBatch,
+)
 from services.access import is_admin
 from services.auth import AuthService, get_auth_service
 from services.pagination import PaginationParams
@@ -53,6 +58,24 @@ async def create_user(
     return user_view
 
 
+@router.post(
+    "/batch",
+    response_model=list[UserAdminView],
+    status_code=status.HTTP_200_OK,
+    summary="The users' info",
+    description="All the information about the users by ids",
+    response_description="The users' login, name and other information",
+)
+async def users_by_ids(
+    users_batch: UsersBatch,
+    access_data: AuthData = Security(is_admin),
+    user_service: UsersService = Depends(get_users_service),
+) -> list[UserAdminView]:
+    users = await user_service.get_users_by_ids(users_batch.ids)
+    users_view = [UserAdminView(**user.model_dump()) for user in users]
+    return users_view
+
+
 @router.get(
     "/{user_id}",
     response_model=UserAdminView,
@@ -57,6 +57,10 @@ class UserListAdminView(BaseModel):
     created_at: datetime
 
 
+class UsersBatch(BaseModel):
+    ids: list[UUID] = Field(min_length=1, max_length=1_000)
+
+
 class UserRoleView(BaseModel):
     id: UUID
     login: str
@@ -32,6 +32,18 @@ class DBService:
         log.info("\nGetting data from the db.\n")
         return item
 
+    async def get_items_by_attribute_in(
+        self, model: Any, attribute: str, values: list[Any]
+    ) -> list[Any]:
+        """Get items with the attribute in the values from the database."""
+
+        stmt = select(model).where(
+            model.__getattribute__(model, attribute).in_(values)
+        )
+        data = await self.db_service.scalars(stmt)
+        log.info("\nGetting data from the db.\n")
+        return data.all()
+
     async def get_items(
         self,
         model: Any,
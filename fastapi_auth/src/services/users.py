@@ -34,6 +34,15 @@ class UsersService(AbstractService):
         user = UserInDB(**jsonable_encoder(user_db))
         return user
 
+    async def get_users_by_ids(self, ids: list[UUID]) -> list[UserInDB]:
+        """Get the users by ids (the users not found are skipped)."""
+
+        users_db = await self.db_service.get_items_by_attribute_in(
+            User, "id", ids
+        )
+        users = [UserInDB(**jsonable_encoder(user)) for user in users_db]
+        return users
+
     async def get_user_by_login(self, login: str):
         """Get user by login."""
 
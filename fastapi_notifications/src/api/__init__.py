@@ -1,9 +1,15 @@
 from fastapi import APIRouter
 
-from api.v1 import notification
+from api.v1 import dead_letters, notification, templates
 
 router = APIRouter()
 
 router.include_router(
     notification.router, prefix="/v1/notifications", tags=["notifications"]
 )
+router.include_router(
+    templates.router, prefix="/v1/templates", tags=["templates"]
+)
+router.include_router(
+    dead_letters.router, prefix="/v1/dead-letters", tags=["dead letters"]
+)
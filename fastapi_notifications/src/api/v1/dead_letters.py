@@ -0,0 +1,56 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+
+from auth.auth import get_current_user
+from schemas.dead_letters import DeadLettersReplayView, DeadLettersView
+from services.dead_letters import (
+    DeadLettersService,
+    get_dead_letters_service,
+)
+
+router = APIRouter()
+
+
+@router.get(
+    "/",
+    response_model=list[DeadLettersView],
+    status_code=status.HTTP_200_OK,
+    summary="The dead letter queues",
+    description="The numbers of the failed messages of the queues",
+    response_description="The dead letter queues data",
+)
+async def get_dead_letters(
+    request: Request,
+    response: Response,
+    dead_letters_service: DeadLettersService = Depends(
+        get_dead_letters_service
+    ),
+    user_id: UUID = Depends(get_current_user),
+) -> list[DeadLettersView]:
+
+    dead_letters = await dead_letters_service.get_dead_letters()
+    return dead_letters
+
+
+@router.post(
+    "/{queue_name}/replay",
+    response_model=DeadLettersReplayView,
+    status_code=status.HTTP_200_OK,
+    summary="Replay the dead messages",
+    description="Return the failed messages to the queue",
+    response_description="The number of the replayed messages",
+)
+async def replay_dead_letters(
+    request: Request,
+    response: Response,
+    queue_name: str,
+    limit: int = Query(1_000, ge=1, le=100_000),
+    dead_letters_service: DeadLettersService = Depends(
+        get_dead_letters_service
+    ),
+    user_id: UUID = Depends(get_current_user),
+) -> DeadLettersReplayView:
+
+    result = await dead_letters_service.replay_dead_letters(queue_name, limit)
+    return result
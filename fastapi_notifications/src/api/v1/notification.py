@@ -1,9 +1,18 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    Query,
+    Request,
+    Response,
+    status,
+)
 
 from auth.auth import get_current_user
 from schemas.notifications import (
+    NotificationBulkCreateDto,
     NotificationCreateDto,
     NotificationDBView,
     NotificationUpdateProfileDto,
@@ -13,7 +22,7 @@ from services.notifications import (
     NotificationsService,
     get_notifications_service,
 )
-from services.pagination import PaginationParams
+from services.pagination import CursorPaginationParams, get_next_cursor
 
 router = APIRouter()
 
@@ -23,13 +32,19 @@ router = APIRouter()
     response_model=NotificationDBView,
     status_code=status.HTTP_200_OK,
     summary="Send a notification",
-    description="Send a notification",
+    description=(
+        "Send a notification (a retry with the same Idempotency-Key "
+        "returns the notification sent)"
+    ),
     response_description="The notification message sent",
 )
 async def create_notification(
     request: Request,
     response: Response,
     notification_task: NotificationCreateDto,
+    idempotency_key: str | None = Header(
+        None, min_length=1, max_length=255
+    ),
     notifications_service: NotificationsService = Depends(
         get_notifications_service
     ),
@@ -37,24 +52,51 @@ async def create_notification(
 ) -> NotificationDBView:
 
     notification = await notifications_service.add_notification_task(
-        notification_task
+        notification_task, idempotency_key=idempotency_key
     )
     return notification
 
 
+@router.post(
+    "/bulk",
+    response_model=list[NotificationDBView],
+    status_code=status.HTTP_200_OK,
+    summary="Send a batch of notifications",
+    description="Send a batch of notifications (e.g. a campaign)",
+    response_description="The notifications messages sent",
+)
+async def create_notifications(
+    request: Request,
+    response: Response,
+    notifications_tasks: NotificationBulkCreateDto,
+    notifications_service: NotificationsService = Depends(
+        get_notifications_service
+    ),
+    user_id: UUID = Depends(get_current_user),
+) -> list[NotificationDBView]:
+
+    notifications = await notifications_service.add_notification_tasks(
+        notifications_tasks.notifications
+    )
+    return notifications
+
+
 @router.get(
     "/",
     response_model=list[NotificationDBView],
     status_code=status.HTTP_200_OK,
     summary="A list of the notifications",
-    description="A paginated list of the notifications",
+    description=(
+        "A paginated list of the notifications "
+        "(the X-Next-Cursor header is the cursor of the next page)"
+    ),
     response_description="The notifications data",
 )
 async def get_notifications(
     request: Request,
     response: Response,
     sort: str | None = Query("-created_at"),
-    pagination: PaginationParams = Depends(),
+    pagination: CursorPaginationParams = Depends(),
     notifications_service: NotificationsService = Depends(
         get_notifications_service
     ),
@@ -64,6 +106,41 @@ async def get_notifications(
     notifications = await notifications_service.get_notifications(
         sort, pagination
     )
+    next_cursor = get_next_cursor(notifications, sort, pagination.page_size)
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return notifications
+
+
+@router.get(
+    "/unsent",
+    response_model=list[NotificationDBView],
+    status_code=status.HTTP_200_OK,
+    summary="A list of the unsent notifications",
+    description=(
+        "A list of the unsent notifications, the oldest first "
+        "(the X-Next-Cursor header is the cursor of the next page)"
+    ),
+    response_description="The notifications data",
+)
+async def get_unsent_notifications(
+    request: Request,
+    response: Response,
+    pagination: CursorPaginationParams = Depends(),
+    notifications_service: NotificationsService = Depends(
+        get_notifications_service
+    ),
+    user_id: UUID = Depends(get_current_user),
+) -> list[NotificationDBView]:
+
+    notifications = await notifications_service.get_unsent_notifications(
+        pagination
+    )
+    next_cursor = get_next_cursor(
+        notifications, "created_at", pagination.page_size
+    )
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
     return notifications
 
 
@@ -143,7 +220,10 @@ async def delete_notification(
     response_model=list[NotificationDBView],
     status_code=status.HTTP_200_OK,
     summary="A list of the user notifications",
-    description="A paginated list of the user notifications",
+    description=(
+        "A paginated list of the user notifications "
+        "(the X-Next-Cursor header is the cursor of the next page)"
+    ),
     response_description="The notifications data",
 )
 async def get_user_notifications(
@@ -152,7 +232,7 @@ async def get_user_notifications(
     user_id: UUID,
     user_id_: UUID = Depends(get_current_user),
     sort: str | None = Query("-created_at"),
-    pagination: PaginationParams = Depends(),
+    pagination: CursorPaginationParams = Depends(),
     notifications_service: NotificationsService = Depends(
         get_notifications_service
     ),
@@ -161,4 +241,7 @@ async def get_user_notifications(
     notifications = await notifications_service.get_user_notifications(
         user_id, sort, pagination
     )
+    next_cursor = get_next_cursor(notifications, sort, pagination.page_size)
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
     return notifications
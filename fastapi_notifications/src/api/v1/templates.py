@@ -0,0 +1,119 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+
+from auth.auth import get_current_user, is_admin
+from schemas.responses import SimpleResultResponse
+from schemas.templates import (
+    TemplateCreateDto,
+    TemplateDBView,
+    TemplateUpdateDto,
+)
+from services.pagination import PaginationParams
+from services.templates import TemplatesService, get_templates_service
+
+router = APIRouter()
+
+
+@router.post(
+    "/",
+    response_model=TemplateDBView,
+    status_code=status.HTTP_200_OK,
+    summary="Create a template",
+    description="Create a notification template",
+    response_description="The template data",
+)
+async def create_template(
+    request: Request,
+    response: Response,
+    template_data: TemplateCreateDto,
+    templates_service: TemplatesService = Depends(get_templates_service),
+    user_id: UUID = Depends(is_admin),
+) -> TemplateDBView:
+
+    template = await templates_service.create_template(template_data)
+    return template
+
+
+@router.get(
+    "/",
+    response_model=list[TemplateDBView],
+    status_code=status.HTTP_200_OK,
+    summary="A list of the templates",
+    description="A paginated list of the templates",
+    response_description="The templates data",
+)
+async def get_templates(
+    request: Request,
+    response: Response,
+    sort: str | None = Query("-created_at"),
+    pagination: PaginationParams = Depends(),
+    templates_service: TemplatesService = Depends(get_templates_service),
+    user_id: UUID = Depends(get_current_user),
+) -> list[TemplateDBView]:
+
+    templates = await templates_service.get_templates(sort, pagination)
+    return templates
+
+
+@router.get(
+    "/{template_id}",
+    response_model=TemplateDBView,
+    status_code=status.HTTP_200_OK,
+    summary="The template",
+    description="The template by id",
+    response_description="The template data",
+)
+async def get_template(
+    request: Request,
+    response: Response,
+    template_id: UUID,
+    templates_service: TemplatesService = Depends(get_templates_service),
+    user_id: UUID = Depends(get_current_user),
+) -> TemplateDBView:
+
+    template = await templates_service.get_template(template_id)
+    return template
+
+
+@router.put(
+    "/{template_id}",
+    response_model=TemplateDBView,
+    status_code=status.HTTP_200_OK,
+    summary="The template",
+    description="Update the template by id",
+    response_description="The template data",
+)
+async def update_template(
+    request: Request,
+    response: Response,
+    template_id: UUID,
+    template_data: TemplateUpdateDto,
+    templates_service: TemplatesService = Depends(get_templates_service),
+    user_id: UUID = Depends(is_admin),
+) -> TemplateDBView:
+
+    template = await templates_service.update_template(
+        template_id, template_data
+    )
+    return template
+
+
+@router.delete(
+    "/{template_id}",
+    response_model=SimpleResultResponse,
+    status_code=status.HTTP_200_OK,
+    summary="The template",
+    description="Delete the template by id",
+    response_description="The result message",
+)
+async def delete_template(
+    request: Request,
+    response: Response,
+    template_id: UUID,
+    templates_service: TemplatesService = Depends(get_templates_service),
+    user_id: UUID = Depends(is_admin),
+) -> SimpleResultResponse:
+
+    await templates_service.delete_template(template_id)
+    return SimpleResultResponse(message="The template deleted.")
@@ -19,9 +19,9 @@ def get_token(request: Request) -> str:
     return token
 
 
-async def get_current_user(token: str = Depends(get_token)) -> UUID:
+def get_token_payload(token: str) -> dict:
     """
-    Get the current user from a JWT token, validating its existence, validity, and expiration.
+    Get the payload of a JWT token, validating its validity and expiration.
     """
 
     try:
@@ -48,4 +48,27 @@ async def get_current_user(token: str = Depends(get_token)) -> UUID:
             detail="The user ID was not found",
         )
 
-    return UUID(user_id)
+    return payload
+
+
+async def get_current_user(token: str = Depends(get_token)) -> UUID:
+    """
+    Get the current user from a JWT token, validating its existence, validity, and expiration.
+    """
+
+    payload = get_token_payload(token)
+    return UUID(payload["sub"])
+
+
+async def is_admin(token: str = Depends(get_token)) -> UUID:
+    """
+    Get the current user from a JWT token, checking the user's role is 'admin'.
+    """
+
+    payload = get_token_payload(token)
+    if payload.get("acc") != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access is denied.",
+        )
+    return UUID(payload["sub"])
@@ -26,6 +26,32 @@ class GlobalConfig(BaseSettings):
     )
     log_sql_queries: bool = True
     generate_events: bool = Field(default=False)
+    former_concurrency: int = Field(default=20)
+    profiles_batch_size: int = Field(default=100)
+    profiles_batch_window: float = Field(default=0.05)
+    profiles_cache_size: int = Field(default=10_000)
+    profiles_cache_ttl: int = Field(default=300)
+    profiles_redis_cache: bool = Field(default=False)
+    token_refresh_margin: int = Field(default=60)
+    sender_concurrency: int = Field(default=10)
+    sent_time_batch_size: int = Field(default=500)
+    sent_time_flush_interval: float = Field(default=1.0)
+    sent_time_max_retries: int = Field(default=5)
+    scheduler_batch_size: int = Field(default=1_000)
+    scheduler_interval: float = Field(default=1.0)
+    relay_batch_size: int = Field(default=1_000)
+    relay_interval: float = Field(default=0.5)
+    idempotency_ttl: int = Field(default=60 * 60 * 24)
+    dedup_ttl: int = Field(default=60 * 60 * 24)
+    # The time to send a claimed notification (until a redelivery)
+    dedup_claim_ttl: int = Field(default=60)
+    # The monthly partitions of notifications created ahead and kept
+    # (the retention 0 keeps all), the old ones are detached and dropped
+    # only if partitions_drop_detached is set
+    partitions_premake: int = Field(default=3)
+    partitions_retention: int = Field(default=0)
+    partitions_drop_detached: bool = Field(default=False)
+    partitions_interval: float = Field(default=60 * 60 * 24)
 
 
 class AuthConfig(BaseSettings):
@@ -92,6 +118,11 @@ class BrokerConfig(BaseSettings):
     prefix: str = Field(default="pyamqp")
     host: str = Field(default="127.0.0.1")
     port: int = Field(default=5672)
+    prefetch_count: int = Field(default=100)
+    max_priority: int = Field(default=10)
+    # The delays (seconds) of the retries, then the dead letter queue
+    retry_delays: list[int] = Field(default=[5, 30, 300])
+    persistent_consumers: bool = Field(default=False)
 
     @property
     def connection(self):
@@ -102,6 +133,24 @@ class BrokerConfig(BaseSettings):
         return connection_
 
 
+class HTTPClientConfig(BaseSettings):
+    """Configuration settings for the service-to-service http client."""
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        env_prefix="http_",
+        extra="ignore",
+    )
+
+    max_connections: int = Field(default=100)
+    max_keepalive_connections: int = Field(default=20)
+    keepalive_expiry: float = Field(default=30.0)
+    timeout: float = Field(default=10.0)
+    connect_timeout: float = Field(default=5.0)
+    http2: bool = Field(default=False)
+
+
 class SMTPConfig(BaseSettings):
     """Configuration settings for SMTP."""
 
@@ -117,6 +166,8 @@ class SMTPConfig(BaseSettings):
     domain: str = Field(default="yandex.ru")
     host: str = Field(default="smtp.yandex.ru")
     port: int = Field(default=465)
+    pool_size: int = Field(default=5)
+    max_messages_per_connection: int = Field(default=100)
 
     @property
     def email(self):
@@ -130,6 +181,68 @@ class SMTPConfig(BaseSettings):
         return True
 
 
+class DeliveryLogConfig(BaseSettings):
+    """Configuration settings for the sender delivery log."""
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        env_prefix="delivery_log_",
+        extra="ignore",
+    )
+
+    directory: str = Field(default="./_temp/outputs")
+    buffer_size: int = Field(default=1_000)
+    flush_interval: float = Field(default=1.0)
+    max_bytes: int = Field(default=10 * 1024 * 1024)
+    backup_count: int = Field(default=5)
+
+
+class TemplatesConfig(BaseSettings):
+    """Configuration settings for the notifications templates."""
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        env_prefix="templates_",
+        extra="ignore",
+    )
+
+    cache_path: str = Field(default="./_temp/templates_cache")
+    cache_size: int = Field(default=400)
+    auto_reload: bool = Field(default=True)
+    stored_ttl: int = Field(default=60)
+    version_interval: float = Field(default=1.0)
+
+
+class ChannelsConfig(BaseSettings):
+    """Configuration settings for the sender delivery channels."""
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        env_prefix="channel_",
+        extra="ignore",
+    )
+
+    email_concurrency: int = Field(default=10)
+    email_batch_size: int = Field(default=1)
+    email_rate_limit: float = Field(default=0)
+    webhook_url: str | None = Field(default=None)
+    webhook_concurrency: int = Field(default=20)
+    webhook_batch_size: int = Field(default=100)
+    webhook_rate_limit: float = Field(default=0)
+    push_concurrency: int = Field(default=50)
+    push_batch_size: int = Field(default=500)
+    push_rate_limit: float = Field(default=0)
+    sms_concurrency: int = Field(default=5)
+    sms_batch_size: int = Field(default=1)
+    sms_rate_limit: float = Field(default=10)
+    other_concurrency: int = Field(default=10)
+    other_batch_size: int = Field(default=1)
+    other_rate_limit: float = Field(default=0)
+
+
 # logging settings
 logging_config.dictConfig(LOGGING)
 
@@ -142,7 +255,11 @@ class Config(BaseSettings):
     db: DataBaseConfig = DataBaseConfig()
     cache: CacheConfig = CacheConfig()
     broker: BrokerConfig = BrokerConfig()
+    http: HTTPClientConfig = HTTPClientConfig()
     smtp: SMTPConfig = SMTPConfig()
+    templates: TemplatesConfig = TemplatesConfig()
+    delivery_log: DeliveryLogConfig = DeliveryLogConfig()
+    channels: ChannelsConfig = ChannelsConfig()
 
 
 config = Config()
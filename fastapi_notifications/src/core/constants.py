@@ -7,9 +7,44 @@ class EXCHANGE_NAMES(BaseModel):
 
 
 class QUEUE_NAMES(BaseModel):
-    CREATED_TASKS: str = Field(default="created_tasks")
+    CREATED_TASKS: str = Field(default="created_tasks.prioritized")
     FORMED_TASKS: str = Field("formed_tasks")
 
 
 EXCHANGES = EXCHANGE_NAMES()
 QUEUES = QUEUE_NAMES()
+# The created queue declared without x-max-priority (retired by the former)
+LEGACY_CREATED_QUEUE = "created_tasks"
+
+
+class CHANNEL_NAMES(BaseModel):
+    EMAIL: str = Field(default="email")
+    WEBHOOK: str = Field(default="webhook")
+    PUSH: str = Field(default="push")
+    SMS: str = Field(default="sms")
+    OTHER: str = Field(default="other")
+
+
+class ROUTING_STAGES(BaseModel):
+    CREATED_TASKS: str = Field(default="created")
+    FORMED_TASKS: str = Field(default="formed")
+
+
+class PRIORITY_NAMES(BaseModel):
+    LOW: str = Field(default="low")
+    NORMAL: str = Field(default="normal")
+    HIGH: str = Field(default="high")
+
+
+CHANNELS = CHANNEL_NAMES()
+STAGES = ROUTING_STAGES()
+PRIORITIES = PRIORITY_NAMES()
+DEFAULT_PRIORITY = PRIORITIES.NORMAL
+RETRY_COUNT_HEADER = "x-retry-count"
+ERROR_HEADER = "x-last-error"
+# AMQP message priorities (the queues are declared with x-max-priority)
+MESSAGE_PRIORITIES = {
+    PRIORITIES.LOW: 0,
+    PRIORITIES.NORMAL: 5,
+    PRIORITIES.HIGH: 9,
+}
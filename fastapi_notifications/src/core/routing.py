@@ -0,0 +1,65 @@
+from core.constants import (
+    CHANNELS,
+    DEFAULT_PRIORITY,
+    MESSAGE_PRIORITIES,
+    QUEUES,
+)
+
+
+def get_channel(notification_type: str) -> str:
+    """Gets the delivery channel of the notification type."""
+
+    if notification_type in CHANNELS.model_dump().values():
+        return notification_type
+    return CHANNELS.OTHER
+
+
+def get_routing_key(
+    stage: str, notification_type: str, priority: str = DEFAULT_PRIORITY
+) -> str:
+    """Gets the routing key `<stage>.<channel>.<priority>`."""
+
+    return f"{stage}.{get_channel(notification_type)}.{priority}"
+
+
+def get_binding_key(stage: str, channel: str | None = None) -> str:
+    """Gets the binding key of the stage (of the channel if it is set)."""
+
+    if channel is None:
+        return f"{stage}.#"
+    return f"{stage}.{channel}.*"
+
+
+def get_channel_queue(queue_name: str, channel: str) -> str:
+    """Gets the name of the channel queue."""
+
+    return f"{queue_name}.{channel}"
+
+
+def get_work_queues() -> list[str]:
+    """Gets the names of the queues consumed by the former and senders."""
+
+    return [QUEUES.CREATED_TASKS] + [
+        get_channel_queue(QUEUES.FORMED_TASKS, channel)
+        for channel in CHANNELS.model_dump().values()
+    ]
+
+
+def get_retry_queue(queue_name: str, delay: int) -> str:
+    """Gets the name of the retry queue of the delay tier."""
+
+    return f"{queue_name}.retry.{delay}s"
+
+
+def get_dead_queue(queue_name: str) -> str:
+    """Gets the name of the dead letter queue."""
+
+    return f"{queue_name}.dead"
+
+
+def get_message_priority(priority: str) -> int:
+    """Gets the AMQP message priority of the notification priority."""
+
+    return MESSAGE_PRIORITIES.get(
+        priority, MESSAGE_PRIORITIES[DEFAULT_PRIORITY]
+    )
@@ -0,0 +1,64 @@
+import re
+from datetime import date, datetime
+
+PARTITION_NAME_PATTERN = r"^{table}_p(\d{{4}})_(\d{{2}})$"
+
+
+def get_month_start(value: date | datetime) -> date:
+    """Gets the first day of the month of the value."""
+
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    """Gets the first day of the month shifted by the months."""
+
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def get_partition_name(table_name: str, month: date) -> str:
+    """Gets the name of the monthly partition (e.g. notifications_p2026_10)."""
+
+    return f"{table_name}_p{month:%Y_%m}"
+
+
+def get_partition_month(table_name: str, partition_name: str) -> date | None:
+    """Gets the month of the monthly partition by its name."""
+
+    match = re.match(
+        PARTITION_NAME_PATTERN.format(table=table_name), partition_name
+    )
+    if match is None:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def get_create_partition_sql(table_name: str, month: date) -> str:
+    """Gets the statement creating the monthly partition of the table."""
+
+    partition_name = get_partition_name(table_name, month)
+    return (
+        f"""CREATE TABLE IF NOT EXISTS "{partition_name}" """
+        f"""PARTITION OF "{table_name}" FOR VALUES """
+        f"""FROM ('{month}') TO ('{add_months(month, 1)}')"""
+    )
+
+
+def get_default_partition_name(table_name: str) -> str:
+    """Gets the name of the default partition."""
+
+    return f"{table_name}_default"
+
+
+def get_create_default_partition_sql(table_name: str) -> str:
+    """Gets the statement creating the default partition of the table.
+
+    The default partition keeps the rows out of the monthly partitions.
+    """
+
+    partition_name = get_default_partition_name(table_name)
+    return (
+        f"""CREATE TABLE IF NOT EXISTS "{partition_name}" """
+        f"""PARTITION OF "{table_name}" DEFAULT"""
+    )
@@ -9,15 +9,21 @@ from api import router
 from core.config import config
 from db import redis
 from middleware.rate_limiter import RateLimiterMiddleware
+from services import http_client
 from tasks.eventer import eventer_task
 from tasks.former import former_task
+from tasks.partitions import partitions_task
+from tasks.relay import relay_task
+from tasks.scheduler import scheduler_task
 from tasks.sender import sender_task
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     redis.redis = Redis(host=config.cache.host, port=config.cache.port)
+    http_client.http_client = http_client.create_http_client()
     yield
+    await http_client.close_http_client()
     await redis.redis.close()
 
 
@@ -38,23 +44,41 @@ celery_app = Celery(
 )
 
 celery_app.conf.beat_schedule = {
-    "former-background-task": {
-        "task": "tasks.former.former_task",
-        "schedule": 2.0,
-        "args": ("former-app",),
-    },
-    "sender-background-task": {
-        "task": "tasks.sender.sender_task",
-        "schedule": 3.0,
-        "args": ("sender-app",),
-    },
     "eventer-background-task": {
         "task": "tasks.eventer.eventer_task",
         "schedule": 10.0,
         "args": ("eventer-app",),
     },
+    "partitions-background-task": {
+        "task": "tasks.partitions.partitions_task",
+        "schedule": config.globals.partitions_interval,
+        "args": ("partitions-app",),
+    },
 }
 
+# The persistent former, sender, scheduler and relay are separate processes
+if not config.broker.persistent_consumers:
+    celery_app.conf.beat_schedule["relay-background-task"] = {
+        "task": "tasks.relay.relay_task",
+        "schedule": config.globals.relay_interval,
+        "args": ("relay-app",),
+    }
+    celery_app.conf.beat_schedule["scheduler-background-task"] = {
+        "task": "tasks.scheduler.scheduler_task",
+        "schedule": config.globals.scheduler_interval,
+        "args": ("scheduler-app",),
+    }
+    celery_app.conf.beat_schedule["former-background-task"] = {
+        "task": "tasks.former.former_task",
+        "schedule": 2.0,
+        "args": ("former-app",),
+    }
+    celery_app.conf.beat_schedule["sender-background-task"] = {
+        "task": "tasks.sender.sender_task",
+        "schedule": 3.0,
+        "args": ("sender-app",),
+    }
+
 
 app.add_middleware(
     RateLimiterMiddleware,
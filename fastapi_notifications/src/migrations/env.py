@@ -4,7 +4,10 @@ from alembic import context
 from sqlalchemy import engine_from_config, pool
 
 from db.postgres import Base, dsn
+from models.idempotency_key import IdempotencyKey  # noqa
 from models.notification import Notification  # noqa
+from models.outbox import OutboxMessage  # noqa
+from models.template import Template  # noqa
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
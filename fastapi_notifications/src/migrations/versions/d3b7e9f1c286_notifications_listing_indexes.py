@@ -0,0 +1,77 @@
+"""notifications listing indexes
+
+Revision ID: d3b7e9f1c286
+Revises: c8a2f4d6e915
+Create Date: 2026-10-18 18:45:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3b7e9f1c286'
+down_revision: Union[str, None] = 'c8a2f4d6e915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The table is large, the indexes are built without locking writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_notifications_user_id_created_at',
+            'notifications',
+            ['user_id', sa.text('created_at DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_notifications_created_at',
+            'notifications',
+            [sa.text('created_at DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_notifications_unsent',
+            'notifications',
+            ['created_at', 'id'],
+            unique=False,
+            postgresql_where=sa.text('last_sent_at IS NULL'),
+            postgresql_concurrently=True,
+        )
+        # Covered by ix_notifications_user_id_created_at
+        op.drop_index(
+            'ix_notifications_user_id',
+            table_name='notifications',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_notifications_user_id',
+            'notifications',
+            ['user_id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_notifications_unsent',
+            table_name='notifications',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_notifications_created_at',
+            table_name='notifications',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_notifications_user_id_created_at',
+            table_name='notifications',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,170 @@
+"""notifications partitions
+
+Revision ID: e5c9a1d7f342
+Revises: d3b7e9f1c286
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from datetime import date, datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5c9a1d7f342'
+down_revision: Union[str, None] = 'd3b7e9f1c286'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The months of the partitions created ahead
+PREMAKE_MONTHS = 3
+COLUMNS = (
+    'id, user_id, user_name, user_email, template_id, subject, message, '
+    'notification_type, priority, send_at, released_at, last_sent_at, '
+    'created_at, updated_at'
+)
+# The partition key can't be NULL
+SELECT_COLUMNS = (
+    'id, user_id, user_name, user_email, template_id, subject, message, '
+    'notification_type, priority, send_at, released_at, last_sent_at, '
+    'COALESCE(created_at, updated_at, now()), updated_at'
+)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def create_notifications_indexes() -> None:
+    op.create_index(
+        'ix_notifications_send_at_pending',
+        'notifications',
+        ['send_at'],
+        unique=False,
+        postgresql_where=sa.text(
+            'released_at IS NULL AND send_at IS NOT NULL'
+        ),
+    )
+    op.create_index(
+        'ix_notifications_user_id_created_at',
+        'notifications',
+        ['user_id', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+    op.create_index(
+        'ix_notifications_created_at',
+        'notifications',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+    op.create_index(
+        'ix_notifications_unsent',
+        'notifications',
+        ['created_at', 'id'],
+        unique=False,
+        postgresql_where=sa.text('last_sent_at IS NULL'),
+    )
+
+
+def upgrade() -> None:
+    # The partitioned table can't keep a unique idempotency key
+    op.create_table('idempotency_keys',
+    sa.Column('id', sa.String(length=255), nullable=False),
+    sa.Column('notification_id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_idempotency_keys_created_at'), 'idempotency_keys', ['created_at'], unique=False)
+    op.execute(
+        'INSERT INTO idempotency_keys (id, notification_id, created_at) '
+        'SELECT idempotency_key, id, created_at FROM notifications '
+        'WHERE idempotency_key IS NOT NULL'
+    )
+
+    # The table is rebuilt: the rows are copied to the monthly partitions
+    # (a large table is better migrated in a maintenance window)
+    op.rename_table('notifications', 'notifications_old')
+    op.create_table('notifications',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('user_name', sa.String(length=255), nullable=False),
+    sa.Column('user_email', sa.String(length=255), nullable=False),
+    sa.Column('template_id', sa.UUID(), nullable=False),
+    sa.Column('subject', sa.String(length=255), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.Column('notification_type', sa.String(length=255), nullable=False),
+    sa.Column('priority', sa.String(length=16), server_default='normal', nullable=False),
+    sa.Column('send_at', sa.DateTime(), nullable=True),
+    sa.Column('released_at', sa.DateTime(), nullable=True),
+    sa.Column('last_sent_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    postgresql_partition_by='RANGE (created_at)'
+    )
+    op.execute(
+        'CREATE TABLE notifications_default PARTITION OF notifications '
+        'DEFAULT'
+    )
+    first_created_at = op.get_bind().scalar(
+        sa.text('SELECT min(created_at) FROM notifications_old')
+    )
+    now = datetime.utcnow()
+    first_created_at = first_created_at or now
+    month = date(first_created_at.year, first_created_at.month, 1)
+    last_month = add_months(date(now.year, now.month, 1), PREMAKE_MONTHS)
+    while month <= last_month:
+        op.execute(
+            f"CREATE TABLE notifications_p{month:%Y_%m} "
+            f"PARTITION OF notifications FOR VALUES "
+            f"FROM ('{month}') TO ('{add_months(month, 1)}')"
+        )
+        month = add_months(month, 1)
+    op.execute(
+        f'INSERT INTO notifications ({COLUMNS}) '
+        f'SELECT {SELECT_COLUMNS} FROM notifications_old'
+    )
+    op.drop_table('notifications_old')
+
+    # The names are free after the old table is dropped
+    op.create_primary_key('notifications_pkey', 'notifications', ['id', 'created_at'])
+    create_notifications_indexes()
+
+
+def downgrade() -> None:
+    op.rename_table('notifications', 'notifications_partitioned')
+    op.create_table('notifications',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('user_name', sa.String(length=255), nullable=False),
+    sa.Column('user_email', sa.String(length=255), nullable=False),
+    sa.Column('template_id', sa.UUID(), nullable=False),
+    sa.Column('subject', sa.String(length=255), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.Column('notification_type', sa.String(length=255), nullable=False),
+    sa.Column('priority', sa.String(length=16), server_default='normal', nullable=False),
+    sa.Column('send_at', sa.DateTime(), nullable=True),
+    sa.Column('released_at', sa.DateTime(), nullable=True),
+    sa.Column('last_sent_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('idempotency_key', sa.String(length=255), nullable=True)
+    )
+    op.execute(
+        f'INSERT INTO notifications ({COLUMNS}, idempotency_key) '
+        f'SELECT notifications_partitioned.*, idempotency_keys.id '
+        f'FROM notifications_partitioned LEFT JOIN idempotency_keys '
+        f'ON idempotency_keys.notification_id = notifications_partitioned.id'
+    )
+    # Drops the partitions too
+    op.drop_table('notifications_partitioned')
+
+    op.create_primary_key('notifications_pkey', 'notifications', ['id'])
+    op.create_unique_constraint('notifications_id_key', 'notifications', ['id'])
+    op.create_index('ix_notifications_idempotency_key', 'notifications', ['idempotency_key'], unique=True)
+    create_notifications_indexes()
+
+    op.drop_index(op.f('ix_idempotency_keys_created_at'), table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
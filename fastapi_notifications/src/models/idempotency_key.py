@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from db.postgres import Base
+
+
+# The partitioned notifications table can't keep a unique key without
+# the partition key (created_at), so the idempotency keys are stored apart
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    # The idempotency key itself
+    id = Column(String(255), primary_key=True)
+    notification_id = Column(UUID(as_uuid=True), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+    def __init__(
+        self,
+        id: str,
+        notification_id: UUID,
+    ) -> None:
+        self.id = id
+        self.notification_id = notification_id
+
+    def __repr__(self) -> str:
+        return f"<IdempotencyKey {self.id}>"
+
+    def as_dict(self):
+        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
@@ -1,31 +1,82 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, String, Text
+from sqlalchemy import (
+    Column,
+    Connection,
+    DateTime,
+    Index,
+    String,
+    Table,
+    Text,
+    text,
+)
 from sqlalchemy.dialects.postgresql import UUID
 
+from core.config import config
+from db.partitions import (
+    add_months,
+    get_create_default_partition_sql,
+    get_create_partition_sql,
+    get_month_start,
+)
 from db.postgres import Base
 
 
+def create_partitions(target: Table, connection: Connection, **kwargs) -> None:
+    """Creates the default and the upcoming monthly partitions."""
+
+    connection.execute(text(get_create_default_partition_sql(target.name)))
+    month = get_month_start(datetime.utcnow())
+    for months in range(config.globals.partitions_premake + 1):
+        connection.execute(
+            text(
+                get_create_partition_sql(
+                    target.name, add_months(month, months)
+                )
+            )
+        )
+
+
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index(
+            "ix_notifications_send_at_pending",
+            "send_at",
+            postgresql_where=text(
+                "released_at IS NULL AND send_at IS NOT NULL"
+            ),
+        ),
+        {
+            "postgresql_partition_by": "RANGE (created_at)",
+            "listeners": [("after_create", create_partitions)],
+        },
+    )
 
     id = Column(
         UUID(as_uuid=True),
         primary_key=True,
         default=uuid.uuid4,
-        unique=True,
         nullable=False,
     )
-    user_id = Column(UUID, nullable=False, index=True)
+    user_id = Column(UUID, nullable=False)
     user_name = Column(String(255), nullable=False, default="")
     user_email = Column(String(255), nullable=False, default="")
     template_id = Column(UUID, nullable=False)
     subject = Column(String(255), nullable=False)
     message = Column(Text, nullable=False)
     notification_type = Column(String(255), nullable=False, default="email")
+    priority = Column(
+        String(16), nullable=False, default="normal", server_default="normal"
+    )
+    send_at = Column(DateTime, nullable=True)
+    released_at = Column(DateTime, nullable=True)
     last_sent_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    # The partition key is a part of the primary key
+    created_at = Column(
+        DateTime, primary_key=True, default=datetime.utcnow, nullable=False
+    )
     updated_at = Column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
@@ -37,8 +88,11 @@ class Notification(Base):
         subject: str,
         message: str,
         notification_type: str,
+        priority: str = "normal",
         user_name: str = "",
         user_email: str = "",
+        send_at: datetime | None = None,
+        released_at: datetime | None = None,
         last_sent_at: datetime | None = None,
     ) -> None:
         self.user_id = user_id
@@ -48,6 +102,9 @@ class Notification(Base):
         self.subject = subject
         self.message = message
         self.notification_type = notification_type
+        self.priority = priority
+        self.send_at = send_at
+        self.released_at = released_at
         self.last_sent_at = last_sent_at
 
     def __repr__(self) -> str:
@@ -55,3 +112,24 @@ class Notification(Base):
 
     def as_dict(self):
         return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+
+
+# The indexes of the listings (ORDER BY created_at, id without a sort)
+Index(
+    "ix_notifications_user_id_created_at",
+    Notification.user_id,
+    Notification.created_at.desc(),
+    Notification.id.desc(),
+)
+Index(
+    "ix_notifications_created_at",
+    Notification.created_at.desc(),
+    Notification.id.desc(),
+)
+# The delivery tracking of the unsent notifications
+Index(
+    "ix_notifications_unsent",
+    Notification.created_at,
+    Notification.id,
+    postgresql_where=Notification.last_sent_at.is_(None),
+)
@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, String, Text
+
+from db.postgres import Base
+
+
+class OutboxMessage(Base):
+    __tablename__ = "outbox"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    exchange_name = Column(String(255), nullable=False)
+    queue_name = Column(String(255), nullable=False)
+    payload = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __init__(
+        self,
+        exchange_name: str,
+        queue_name: str,
+        payload: str,
+    ) -> None:
+        self.exchange_name = exchange_name
+        self.queue_name = queue_name
+        self.payload = payload
+
+    def __repr__(self) -> str:
+        return f"<OutboxMessage {self.id}>"
+
+    def as_dict(self):
+        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
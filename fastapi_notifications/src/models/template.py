@@ -0,0 +1,39 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+
+from db.postgres import Base
+
+
+class Template(Base):
+    __tablename__ = "templates"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        unique=True,
+        nullable=False,
+    )
+    name = Column(String(255), nullable=False)
+    body = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+    def __init__(
+        self,
+        name: str,
+        body: str,
+    ) -> None:
+        self.name = name
+        self.body = body
+
+    def __repr__(self) -> str:
+        return f"<Template {self.id}>"
+
+    def as_dict(self):
+        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+
+class DeadLettersView(BaseModel):
+    queue_name: str
+    message_count: int
+
+
+class DeadLettersReplayView(BaseModel):
+    queue_name: str
+    replayed: int
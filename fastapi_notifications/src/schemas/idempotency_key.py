@@ -0,0 +1,8 @@
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class IdempotencyKeyCreateDto(BaseModel):
+    id: str
+    notification_id: UUID
@@ -1,7 +1,7 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 class NotificationCreateDto(BaseModel):
@@ -10,6 +10,29 @@ class NotificationCreateDto(BaseModel):
     subject: str
     message: str
     notification_type: str = Field(default="email")
+    priority: str = Field(
+        default="normal", pattern="^(low|normal|high)$"
+    )
+    send_at: datetime | None = Field(default=None)
+
+    @field_validator("send_at")
+    @classmethod
+    def convert_to_utc(cls, value: datetime | None) -> datetime | None:
+        """Converts the send time to the naive UTC time of the database."""
+
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+
+class NotificationCreateDBDto(NotificationCreateDto):
+    released_at: datetime | None = None
+
+
+class NotificationBulkCreateDto(BaseModel):
+    notifications: list[NotificationCreateDto] = Field(
+        min_length=1, max_length=10_000
+    )
 
 
 class NotificationUpdateProfileDto(BaseModel):
@@ -30,6 +53,7 @@ class NotificationTask(BaseModel):
     subject: str
     message: str
     notification_type: str
+    priority: str = Field(default="normal")
 
 
 class NotificationDBView(BaseModel):
@@ -41,6 +65,9 @@ class NotificationDBView(BaseModel):
     subject: str
     message: str
     notification_type: str
+    priority: str = Field(default="normal")
+    send_at: datetime | None = None
+    released_at: datetime | None = None
     last_sent_at: datetime | None
     created_at: datetime
     updated_at: datetime
@@ -56,4 +83,7 @@ class NotificationResponseDto(BaseModel):
     subject: str
     message: str
     notification_type: str
+    priority: str = Field(default="normal")
+    send_at: datetime | None = None
+    released_at: datetime | None = None
     last_sent_at: datetime | None
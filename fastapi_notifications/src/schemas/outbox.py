@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class OutboxMessageCreateDto(BaseModel):
+    exchange_name: str
+    queue_name: str
+    payload: str
@@ -0,0 +1,22 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class TemplateCreateDto(BaseModel):
+    name: str
+    body: str
+
+
+class TemplateUpdateDto(BaseModel):
+    name: str
+    body: str
+
+
+class TemplateDBView(BaseModel):
+    id: UUID
+    name: str
+    body: str
+    created_at: datetime
+    updated_at: datetime
@@ -1,16 +1,33 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Coroutine
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, Callable, Coroutine
 
 from aio_pika import DeliveryMode, ExchangeType, Message, connect_robust
+from aio_pika.abc import (
+    AbstractChannel,
+    AbstractConnection,
+    AbstractExchange,
+    AbstractIncomingMessage,
+    AbstractQueue,
+)
 from aio_pika.exceptions import (
     AMQPChannelError,
     AMQPConnectionError,
+    ChannelNotFoundEntity,
     QueueEmpty,
 )
 from aio_pika.pool import Pool
+from pamqp.commands import Basic
 
 from core.config import config
+from core.constants import ERROR_HEADER, RETRY_COUNT_HEADER
 from core.logger import log
+from core.routing import get_dead_queue, get_retry_queue
+
+
+class RejectedMessageError(Exception):
+    """The message can not be processed and must not be retried."""
 
 
 class Broker(ABC):
@@ -22,6 +39,12 @@ class Broker(ABC):
     @abstractmethod
     def publish(self, *args, **kwargs): ...
 
+    @abstractmethod
+    async def add_messages(self, *args, **kwargs): ...
+
+    @abstractmethod
+    async def publish_many(self, *args, **kwargs): ...
+
     @abstractmethod
     async def get_messages(self, *args, **kwargs): ...
 
@@ -36,6 +59,11 @@ class BrokerService(Broker):
         self,
     ) -> None:
         self._connection_pool: Pool | None = None
+        self._channels: dict[AbstractConnection, AbstractChannel] = {}
+        self._exchanges: dict[
+            AbstractConnection, dict[tuple[str, str, str], AbstractExchange]
+        ] = {}
+        self._topology_lock = asyncio.Lock()
 
     async def initialize_connection_pool(self) -> None:
         """Initializes broker connection pool."""
@@ -51,14 +79,103 @@ class BrokerService(Broker):
         """Closes broker connection pool."""
 
         if self._connection_pool:
+            self._channels.clear()
+            self._exchanges.clear()
             await self._connection_pool.close()
             log.info("Broker: Connection pool closed.")
 
+    @asynccontextmanager
+    async def get_connection(self) -> AsyncGenerator:
+        """Acquires a connection from the broker connection pool."""
+
+        await self.initialize_connection_pool()
+        async with self._connection_pool.acquire() as connection:
+            yield connection
+
+    async def get_channel(
+        self, connection: AbstractConnection
+    ) -> AbstractChannel:
+        """Gets the cached publisher channel of the connection."""
+
+        channel = self._channels.get(connection)
+        if channel is None or channel.is_closed:
+            channel = await connection.channel()
+            self._channels[connection] = channel
+            # The topology has to be declared on the new channel
+            self._exchanges.pop(connection, None)
+            log.debug("Broker: A publisher channel opened.")
+        return channel
+
+    async def declare_queue(
+        self, channel: AbstractChannel, queue_name: str
+    ) -> AbstractQueue:
+        """Declares the durable priority queue."""
+
+        return await channel.declare_queue(
+            name=queue_name,
+            durable=True,
+            arguments={"x-max-priority": config.broker.max_priority},
+        )
+
+    async def declare_retry_topology(
+        self, channel: AbstractChannel, queue_name: str
+    ) -> None:
+        """Declares the retry delay tiers and the dead letter queue.
+
+        The messages expired in a tier queue are dead-lettered back
+        to the queue through the default exchange.
+        """
+
+        for delay in config.broker.retry_delays:
+            await channel.declare_queue(
+                name=get_retry_queue(queue_name, delay),
+                durable=True,
+                arguments={
+                    "x-message-ttl": delay * 1_000,
+                    "x-dead-letter-exchange": "",
+                    "x-dead-letter-routing-key": queue_name,
+                },
+            )
+        await channel.declare_queue(
+            name=get_dead_queue(queue_name), durable=True
+        )
+
+    async def declare_topology(
+        self,
+        connection: AbstractConnection,
+        exchange_name: str,
+        queue_name: str,
+        binding_key: str = "#",
+    ) -> AbstractExchange:
+        """Declares the exchange and the bound queue once per connection."""
+
+        # Concurrent publishers share the channel of the connection
+        async with self._topology_lock:
+            channel = await self.get_channel(connection)
+            exchanges = self._exchanges.setdefault(connection, {})
+            topology_key = (exchange_name, queue_name, binding_key)
+            exchange = exchanges.get(topology_key)
+            if exchange is None:
+                log.info(
+                    f"\nProducer: queue_name: {queue_name}, "
+                    f"binding_key: {binding_key}"
+                )
+                exchange = await channel.declare_exchange(
+                    name=exchange_name, type=ExchangeType.TOPIC
+                )
+                queue = await self.declare_queue(channel, queue_name)
+                await queue.bind(exchange=exchange, routing_key=binding_key)
+                exchanges[topology_key] = exchange
+        return exchange
+
     async def add_message(
         self,
         message: Any,
         exchange_name: str,
         queue_name: str,
+        routing_key: str = "#",
+        binding_key: str = "#",
+        priority: int | None = None,
     ) -> None:
         """Adds messages to a queue."""
 
@@ -73,7 +190,13 @@ class BrokerService(Broker):
             await self.initialize_connection_pool()
             async with self._connection_pool.acquire() as connection:
                 await self.publish(
-                    connection, exchange_name, queue_name, message
+                    connection,
+                    exchange_name,
+                    queue_name,
+                    message,
+                    routing_key=routing_key,
+                    binding_key=binding_key,
+                    priority=priority,
                 )
 
             log.info(f"\n[✅] {message}")
@@ -86,26 +209,116 @@ class BrokerService(Broker):
 
     async def publish(
         self,
-        connection: Coroutine,
+        connection: AbstractConnection,
         exchange_name: str,
         queue_name: str,
         message_data: Any,
+        routing_key: str = "#",
+        binding_key: str = "#",
+        priority: int | None = None,
     ) -> None:
         """A method for producing messages."""
 
-        async with connection.channel() as channel:
-            log.info(f"\nProducer: queue_name: {queue_name}")
-            exchange = await channel.declare_exchange(
-                name=exchange_name, type=ExchangeType.TOPIC
+        exchange = await self.declare_topology(
+            connection, exchange_name, queue_name, binding_key
+        )
+        message_body = message_data.model_dump_json().encode("utf-8")
+        message = Message(
+            message_body,
+            delivery_mode=DeliveryMode.PERSISTENT,
+            priority=priority,
+        )
+        await exchange.publish(message, routing_key=routing_key)
+
+    async def add_messages(
+        self,
+        messages: list[Any],
+        exchange_name: str,
+        queue_name: str,
+        routing_key: str | Callable[[Any], str] = "#",
+        binding_key: str = "#",
+        priority: int | Callable[[Any], int] | None = None,
+    ) -> list[Any]:
+        """Adds a batch of messages to a queue."""
+
+        try:
+            log.info(f"Broker: self._connection_pool: {self._connection_pool}")
+
+            await self.initialize_connection_pool()
+            async with self._connection_pool.acquire() as connection:
+                accepted_messages = await self.publish_many(
+                    connection,
+                    exchange_name,
+                    queue_name,
+                    messages,
+                    routing_key=routing_key,
+                    binding_key=binding_key,
+                    priority=priority,
+                )
+
+            log.info(
+                f"\n[✅] {len(accepted_messages)} of {len(messages)} "
+                f"messages accepted by the broker."
             )
-            queue = await channel.declare_queue(queue_name, durable=True)
-            await queue.bind(exchange=exchange, routing_key="#")
-            message_body = message_data.model_dump_json().encode("utf-8")
-            message = Message(
-                message_body,
-                delivery_mode=DeliveryMode.PERSISTENT,
+            return accepted_messages
+        except (AMQPConnectionError, AMQPChannelError) as err:
+            log.info(f"Broker: An error connecting to RabbitMQ: {err}")
+            raise
+        except Exception as err:
+            log.info(f"Broker: An unexpected error: {err}")
+            raise
+
+    async def publish_many(
+        self,
+        connection: AbstractConnection,
+        exchange_name: str,
+        queue_name: str,
+        messages_data: list[Any],
+        batch_size: int = 1_000,
+        routing_key: str | Callable[[Any], str] = "#",
+        binding_key: str = "#",
+        priority: int | Callable[[Any], int] | None = None,
+    ) -> list[Any]:
+        """A method for producing messages with pipelined confirms.
+
+        `routing_key` and `priority` may be functions of the message data.
+        Returns the messages data confirmed by the broker.
+        """
+
+        exchange = await self.declare_topology(
+            connection, exchange_name, queue_name, binding_key
+        )
+        get_routing_key = (
+            routing_key if callable(routing_key) else lambda _: routing_key
+        )
+        get_priority = priority if callable(priority) else lambda _: priority
+
+        accepted_messages = []
+        for start in range(0, len(messages_data), batch_size):
+            batch = messages_data[start : start + batch_size]
+            confirmations = await asyncio.gather(
+                *[
+                    exchange.publish(
+                        Message(
+                            message_data.model_dump_json().encode("utf-8"),
+                            delivery_mode=DeliveryMode.PERSISTENT,
+                            priority=get_priority(message_data),
+                        ),
+                        routing_key=get_routing_key(message_data),
+                    )
+                    for message_data in batch
+                ],
+                return_exceptions=True,
             )
-            await exchange.publish(message, routing_key="#")
+            for message_data, confirmation in zip(batch, confirmations):
+                if isinstance(confirmation, Basic.Ack):
+                    accepted_messages.append(message_data)
+                else:
+                    log.error(
+                        f"Broker: The message was not confirmed: "
+                        f"{message_data}, reason: {confirmation}"
+                    )
+        return accepted_messages
 
     async def get_messages(
         self,
@@ -113,6 +326,8 @@ class BrokerService(Broker):
         queue_name: str,
         async_process_func: Callable | None = None,
         batch_size: int = 1_000,
+        concurrency: int = 1,
+        binding_key: str = "#",
         **kwargs,
     ) -> Any:
         """Gets messages from the queue."""
@@ -128,6 +343,8 @@ class BrokerService(Broker):
                     queue_name,
                     async_process_func,
                     batch_size,
+                    concurrency,
+                    binding_key=binding_key,
                     **kwargs,
                 )
 
@@ -138,6 +355,208 @@ class BrokerService(Broker):
             log.info(f"An unexpected error: {err}")
             raise
 
+    async def handle_message(
+        self,
+        message: AbstractIncomingMessage,
+        async_process_func: Callable | None,
+        semaphore: asyncio.Semaphore,
+        retry_channel: AbstractChannel | None = None,
+        queue_name: str | None = None,
+        **kwargs,
+    ) -> None:
+        """Processes the message and confirms it after success.
+
+        A failed message is sent to the retry tiers of the queue
+        (`retry_channel`), then to the dead letter queue. If both are not
+        possible, the message stays unacknowledged until the channel
+        is closed (no redelivery loop).
+        """
+
+        try:
+            message_body = message.body.decode("utf-8")
+
+            # Process_message function
+            if async_process_func is not None:
+                await async_process_func(message_body, **kwargs)
+        except Exception as err:
+            log.error(f"Broker: An error while processing the message: {err}")
+            if retry_channel is not None and (
+                await self.retry_message(
+                    retry_channel, message, queue_name, err
+                )
+                or await self.retry_message(
+                    retry_channel, message, queue_name, err, dead=True
+                )
+            ):
+                await message.ack()
+            else:
+                log.error("Broker: The message is left unacknowledged.")
+        else:
+            # Confirmation of receipt of the message
+            await message.ack()
+        finally:
+            semaphore.release()
+
+    async def retry_message(
+        self,
+        channel: AbstractChannel,
+        message: AbstractIncomingMessage,
+        queue_name: str,
+        error: Exception,
+        dead: bool = False,
+    ) -> bool:
+        """Publishes the failed message to the next retry delay tier.
+
+        After the last tier (or if the message is rejected or `dead`
+        is set) the message goes to the dead letter queue.
+        Returns False if it is not possible.
+        """
+
+        headers = dict(message.headers or {})
+        retry_count = int(headers.get(RETRY_COUNT_HEADER, 0))
+        retry_delays = config.broker.retry_delays
+        if dead or isinstance(error, RejectedMessageError):
+            target_queue = get_dead_queue(queue_name)
+        elif retry_count >= len(retry_delays):
+            target_queue = get_dead_queue(queue_name)
+        else:
+            target_queue = get_retry_queue(
+                queue_name, retry_delays[retry_count]
+            )
+            retry_count += 1
+
+        headers[RETRY_COUNT_HEADER] = retry_count
+        headers[ERROR_HEADER] = str(error)[:1_000]
+        try:
+            await channel.default_exchange.publish(
+                Message(
+                    message.body,
+                    headers=headers,
+                    delivery_mode=DeliveryMode.PERSISTENT,
+                    priority=message.priority,
+                ),
+                routing_key=target_queue,
+            )
+        except Exception as err:
+            log.error(f"Broker: An error while retrying the message: {err}")
+            return False
+
+        log.warning(
+            f"Broker: The message was moved to {target_queue} "
+            f"(retries: {retry_count})."
+        )
+        return True
+
+    async def replay_messages(
+        self, queue_name: str, limit: int = 1_000
+    ) -> int:
+        """Moves the messages of the dead letter queue back to the queue.
+
+        Returns the number of the replayed messages.
+        """
+
+        replayed = 0
+        async with self.get_connection() as connection:
+            async with connection.channel() as channel:
+                await self.declare_queue(channel, queue_name)
+                dead_queue = await channel.declare_queue(
+                    name=get_dead_queue(queue_name), durable=True
+                )
+                while replayed < limit:
+                    message = await dead_queue.get(timeout=1, fail=False)
+                    if message is None:
+                        break
+
+                    headers = dict(message.headers or {})
+                    headers.pop(RETRY_COUNT_HEADER, None)
+                    headers.pop(ERROR_HEADER, None)
+                    await channel.default_exchange.publish(
+                        Message(
+                            message.body,
+                            headers=headers,
+                            delivery_mode=DeliveryMode.PERSISTENT,
+                            priority=message.priority,
+                        ),
+                        routing_key=queue_name,
+                    )
+                    await message.ack()
+                    replayed += 1
+
+        log.info(f"Broker: {replayed} messages replayed to {queue_name}.")
+        return replayed
+
+    async def get_dead_messages_count(self, queue_name: str) -> int:
+        """Gets the number of the messages in the dead letter queue."""
+
+        async with self.get_connection() as connection:
+            async with connection.channel() as channel:
+                dead_queue = await channel.declare_queue(
+                    name=get_dead_queue(queue_name), durable=True
+                )
+                return dead_queue.declaration_result.message_count
+
+    async def retire_queue(
+        self,
+        exchange_name: str,
+        queue_name: str,
+        get_routing_key: Callable[[bytes], str],
+        target_queues: dict[str, str],
+        binding_key: str = "#",
+    ) -> int:
+        """Unbinds the legacy queue and moves its messages to the exchange.
+
+        The target queues (name: binding key) are declared first, then
+        the messages are republished with `get_routing_key(body)` and
+        the empty queue is deleted. Returns the number of moved messages.
+        """
+
+        moved = 0
+        async with self.get_connection() as connection:
+            try:
+                async with connection.channel() as channel:
+                    await channel.declare_queue(name=queue_name, passive=True)
+            except ChannelNotFoundEntity:
+                return moved
+
+            async with connection.channel() as channel:
+                exchange = await channel.declare_exchange(
+                    name=exchange_name, type=ExchangeType.TOPIC
+                )
+                for target_queue, target_binding_key in target_queues.items():
+                    queue = await self.declare_queue(channel, target_queue)
+                    await queue.bind(exchange, target_binding_key)
+                queue = await channel.declare_queue(
+                    name=queue_name, passive=True
+                )
+                await queue.unbind(exchange, binding_key)
+                while True:
+                    message = await queue.get(timeout=1, fail=False)
+                    if message is None:
+                        break
+
+                    await exchange.publish(
+                        Message(
+                            message.body,
+                            headers=dict(message.headers or {}),
+                            delivery_mode=DeliveryMode.PERSISTENT,
+                            priority=message.priority,
+                        ),
+                        routing_key=get_routing_key(message.body),
+                    )
+                    await message.ack()
+                    moved += 1
+
+            try:
+                async with connection.channel() as channel:
+                    await channel.queue_delete(
+                        queue_name, if_unused=True, if_empty=True
+                    )
+            except AMQPChannelError as err:
+                log.warning(f"Broker: The queue {queue_name} is kept: {err}")
+
+        log.info(f"Broker: {queue_name} retired, {moved} messages moved.")
+        return moved
+
     async def consume(
         self,
         connection: Coroutine,
@@ -145,9 +564,14 @@ class BrokerService(Broker):
         queue_name: str,
         async_process_func: Callable | None = None,
         batch_size: int = 1_000,
+        concurrency: int = 1,
+        binding_key: str = "#",
         **kwargs,
     ) -> list[str]:
-        """A method for consuming messages."""
+        """A method for consuming messages.
+
+        Up to `concurrency` messages are processed at the same time.
+        """
 
         async with connection:
             channel = await connection.channel()
@@ -157,31 +581,138 @@ class BrokerService(Broker):
                 name=exchange_name, type=ExchangeType.TOPIC
             )
 
-            log.info(f"\nConsumer: queue_name: {queue_name}")
-            queue = await channel.declare_queue(name=queue_name, durable=True)
-            await queue.bind(exchange, "#")
+            log.info(
+                f"\nConsumer: queue_name: {queue_name}, "
+                f"binding_key: {binding_key}"
+            )
+            queue = await self.declare_queue(channel, queue_name)
+            await queue.bind(exchange, binding_key)
+            await self.declare_retry_topology(channel, queue_name)
 
+            semaphore = asyncio.Semaphore(concurrency)
+            tasks: set[asyncio.Task] = set()
             messages = []
             counter = 0
             while counter < batch_size:
+                await semaphore.acquire()
                 try:
                     message = await queue.get(timeout=1)
-                    message_body = message.body.decode("utf-8")
-                    log.info(f"Got a message: {message_body}")
-
-                    messages.append(message_body)
-
-                    # Process_message function
-                    if async_process_func is not None:
-                        await async_process_func(message_body, **kwargs)
-
-                    # Confirmation of receipt of the message
-                    await message.ack()
-                    counter += 1
                 except QueueEmpty:
+                    semaphore.release()
                     log.info("\nNo messages available.\n")
                     break
 
+                message_body = message.body.decode("utf-8")
+                log.info(f"Got a message: {message_body}")
+                messages.append(message_body)
+
+                task = asyncio.create_task(
+                    self.handle_message(
+                        message,
+                        async_process_func,
+                        semaphore,
+                        retry_channel=channel,
+                        queue_name=queue_name,
+                        **kwargs,
+                    )
+                )
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                counter += 1
+
+            await asyncio.gather(*tasks)
             return messages
 
         log.info(f"Broker: Connection closed.\n")
+
+    async def listen_messages(
+        self,
+        exchange_name: str,
+        queue_name: str,
+        async_process_func: Callable,
+        prefetch_count: int | None = None,
+        concurrency: int = 1,
+        binding_key: str = "#",
+        **kwargs,
+    ) -> None:
+        """Listens to the queue until the consumer is cancelled."""
+
+        try:
+            log.info(f"Broker: self._connection_pool: {self._connection_pool}")
+
+            await self.initialize_connection_pool()
+            async with self._connection_pool.acquire() as connection:
+                await self.consume_forever(
+                    connection,
+                    exchange_name,
+                    queue_name,
+                    async_process_func,
+                    prefetch_count,
+                    concurrency,
+                    binding_key=binding_key,
+                    **kwargs,
+                )
+
+        except (AMQPConnectionError, AMQPChannelError) as err:
+            log.info(f"An error connecting to RabbitMQ: {err}")
+            raise
+        except Exception as err:
+            log.info(f"An unexpected error: {err}")
+            raise
+
+    async def consume_forever(
+        self,
+        connection: Coroutine,
+        exchange_name: str,
+        queue_name: str,
+        async_process_func: Callable,
+        prefetch_count: int | None = None,
+        concurrency: int = 1,
+        binding_key: str = "#",
+        **kwargs,
+    ) -> None:
+        """A method for consuming messages pushed by the broker.
+
+        Up to `concurrency` messages are processed at the same time.
+        """
+
+        if prefetch_count is None:
+            prefetch_count = config.broker.prefetch_count
+
+        async with connection.channel() as channel:
+            await channel.set_qos(prefetch_count=prefetch_count)
+            log.debug(f"Broker: Connected successfully to RabbitMQ.")
+
+            exchange = await channel.declare_exchange(
+                name=exchange_name, type=ExchangeType.TOPIC
+            )
+
+            log.info(
+                f"\nConsumer: queue_name: {queue_name}, "
+                f"binding_key: {binding_key}, "
+                f"prefetch_count: {prefetch_count}, "
+                f"concurrency: {concurrency}"
+            )
+            queue = await self.declare_queue(channel, queue_name)
+            await queue.bind(exchange, binding_key)
+            await self.declare_retry_topology(channel, queue_name)
+
+            semaphore = asyncio.Semaphore(concurrency)
+            tasks: set[asyncio.Task] = set()
+            async with queue.iterator() as queue_iter:
+                async for message in queue_iter:
+                    log.info(f"Got a message: {message.body.decode('utf-8')}")
+
+                    await semaphore.acquire()
+                    task = asyncio.create_task(
+                        self.handle_message(
+                            message,
+                            async_process_func,
+                            semaphore,
+                            retry_channel=channel,
+                            queue_name=queue_name,
+                            **kwargs,
+                        )
+                    )
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
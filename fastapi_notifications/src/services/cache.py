@@ -40,6 +40,52 @@ class CacheService(Cache):
         await client.set(key, data, expire)
         log.info("\nThe data is placed in redis.\n")
 
+    async def add(
+        self,
+        client: Redis,
+        key: str,
+        data: str,
+        expire: int,
+    ) -> bool:
+        """Puts data in cache unless the key exists (SET NX).
+
+        Returns False if the key already exists.
+        """
+
+        return bool(await client.set(key, data, ex=expire, nx=True))
+
+    async def incr(self, client: Redis, key: str) -> int:
+        """Increments the counter in cache."""
+
+        return await client.incr(key)
+
+    async def delete(self, client: Redis, key: str) -> None:
+        """Deletes data from cache."""
+
+        await client.delete(key)
+        log.info("\nThe data is deleted from redis.\n")
+
+    async def get_many(self, client: Redis, keys: list[str]) -> list[Any]:
+        """Gets data of the keys from cache (None for the missing keys)."""
+
+        data = await client.mget(keys)
+        log.info("\nThe data is taken from redis.\n")
+        return data
+
+    async def set_many(
+        self,
+        client: Redis,
+        data: dict[str, str],
+        expire: int,
+    ) -> None:
+        """Puts data of the keys in cache."""
+
+        async with client.pipeline(transaction=False) as pipe:
+            for key, value in data.items():
+                pipe.set(key, value, expire)
+            await pipe.execute()
+        log.info("\nThe data is placed in redis.\n")
+
 
 # class CacheService(Cache):
 #     """Cache managing service."""
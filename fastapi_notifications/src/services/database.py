@@ -2,9 +2,18 @@ from abc import ABC, abstractmethod
 from typing import Any, Generic, Type, TypeVar
 from uuid import UUID
 
-from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy import asc, desc, select
+from sqlalchemy import (
+    asc,
+    column,
+    delete,
+    desc,
+    insert,
+    select,
+    tuple_,
+    update,
+    values,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.postgres import Base
@@ -27,15 +36,33 @@ class Repository(ABC):
     @abstractmethod
     def get_many_with_condition(self, *args, **kwargs): ...
 
+    @abstractmethod
+    def get_many_by_keyset(self, *args, **kwargs): ...
+
+    @abstractmethod
+    def get_many_for_update(self, *args, **kwargs): ...
+
     @abstractmethod
     def create(self, *args, **kwargs): ...
 
+    @abstractmethod
+    def create_many(self, *args, **kwargs): ...
+
     @abstractmethod
     def update(self, *args, **kwargs): ...
 
+    @abstractmethod
+    def update_many(self, *args, **kwargs): ...
+
     @abstractmethod
     def delete(self, *args, **kwargs): ...
 
+    @abstractmethod
+    def delete_many(self, *args, **kwargs): ...
+
+    @abstractmethod
+    def delete_many_with_conditions(self, *args, **kwargs): ...
+
 
 class RepositoryDB(
     Repository, Generic[ModelType, CreateSchemaType, UpdateSchemaType]
@@ -71,7 +98,10 @@ class RepositoryDB(
 
         statement = (
             select(self._model)
-            .order_by(order(getattr(self._model, sort_field)))
+            .order_by(
+                order(getattr(self._model, sort_field)),
+                order(self._model.id),
+            )
             .offset(skip)
             .limit(limit)
         )
@@ -102,24 +132,106 @@ class RepositoryDB(
             .where(
                 self._model.__getattribute__(self._model, attribute) == value
             )
-            .order_by(order(getattr(self._model, sort_field)))
+            .order_by(
+                order(getattr(self._model, sort_field)),
+                order(self._model.id),
+            )
             .offset(skip)
             .limit(limit)
         )
         results = await db.execute(statement=statement)
         return results.scalars().all()
 
+    async def get_many_by_keyset(
+        self,
+        db: AsyncSession,
+        *,
+        conditions: list[Any] | None = None,
+        sort: str = "-created_at",
+        cursor: tuple[Any, Any] | None = None,
+        limit: int = 100,
+    ) -> list[ModelType]:
+        """Gets a list of items after the cursor (keyset pagination).
+
+        The cursor is the sort field value and the id of the last item
+        of the previous page, the id breaks the ties.
+        """
+
+        order = (asc, desc)[sort.startswith("-")]
+        sort_field = getattr(self._model, sort.lstrip("+-"))
+
+        statement = select(self._model).where(*(conditions or []))
+        if cursor is not None:
+            keys = tuple_(sort_field, self._model.id)
+            if sort.startswith("-"):
+                statement = statement.where(keys < tuple_(*cursor))
+            else:
+                statement = statement.where(keys > tuple_(*cursor))
+        statement = statement.order_by(
+            order(sort_field), order(self._model.id)
+        ).limit(limit)
+        results = await db.execute(statement=statement)
+        return results.scalars().all()
+
+    async def get_many_for_update(
+        self,
+        db: AsyncSession,
+        *,
+        conditions: list[Any],
+        sort: str = "created_at",
+        limit: int = 100,
+    ) -> list[ModelType]:
+        """Gets and locks items skipping the items locked by others.
+
+        The locks are held until the session transaction ends.
+        """
+
+        statement = (
+            select(self._model)
+            .where(*conditions)
+            .order_by(getattr(self._model, sort))
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        results = await db.execute(statement=statement)
+        return results.scalars().all()
+
     async def create(
         self, db: AsyncSession, *, obj_in: CreateSchemaType
     ) -> ModelType:
         """Creates an item."""
 
-        obj_in_data = jsonable_encoder(obj_in)
+        # The datetime and UUID objects are kept for the database driver
+        obj_in_data = obj_in.model_dump()
         db_obj = self._model(**obj_in_data)
         db.add(db_obj)
         await db.commit()
         return db_obj
 
+    async def create_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: list[CreateSchemaType],
+        commit: bool = True,
+    ) -> list[ModelType]:
+        """Creates items with a multi-row INSERT ... RETURNING.
+
+        With `commit=False` the items are a part of the session transaction.
+        """
+
+        if not objs_in:
+            return []
+
+        objs_in_data = [obj_in.model_dump() for obj_in in objs_in]
+        results = await db.scalars(
+            insert(self._model).returning(self._model), objs_in_data
+        )
+        db_objs = results.all()
+        if commit:
+            await db.commit()
+        return db_objs
+
     async def update(
         self,
         db: AsyncSession,
@@ -131,6 +243,39 @@ class RepositoryDB(
         await db.refresh(db_obj)
         return db_obj
 
+    async def update_many(
+        self,
+        db: AsyncSession,
+        *,
+        rows: list[dict[str, Any]],
+    ) -> None:
+        """Updates items with one UPDATE ... FROM (VALUES ...).
+
+        Each row contains the item `id` and the same updated fields.
+        """
+
+        if not rows:
+            return None
+
+        fields = [field for field in rows[0] if field != "id"]
+        data = [(row["id"], *(row[field] for field in fields)) for row in rows]
+        rows_values = values(
+            column("id", self._model.id.type),
+            *[
+                column(field, getattr(self._model, field).type)
+                for field in fields
+            ],
+            name="rows_values",
+        ).data(data)
+        statement = (
+            update(self._model)
+            .where(self._model.id == rows_values.c.id)
+            .values({field: rows_values.c[field] for field in fields})
+            .execution_options(synchronize_session=False)
+        )
+        await db.execute(statement)
+        await db.commit()
+
     async def delete(
         self,
         db: AsyncSession,
@@ -143,3 +288,42 @@ class RepositoryDB(
         await db.commit()
         db_obj = None
         return db_obj
+
+    async def delete_many(
+        self,
+        db: AsyncSession,
+        *,
+        ids: list[Any],
+    ) -> None:
+        """Deletes the items by ids."""
+
+        if not ids:
+            return None
+
+        statement = (
+            delete(self._model)
+            .where(self._model.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        await db.execute(statement)
+        await db.commit()
+
+    async def delete_many_with_conditions(
+        self,
+        db: AsyncSession,
+        *,
+        conditions: list[Any],
+    ) -> int:
+        """Deletes the items with the conditions.
+
+        Returns the number of the deleted items.
+        """
+
+        statement = (
+            delete(self._model)
+            .where(*conditions)
+            .execution_options(synchronize_session=False)
+        )
+        results = await db.execute(statement)
+        await db.commit()
+        return results.rowcount
@@ -0,0 +1,58 @@
+from functools import lru_cache
+
+from fastapi import HTTPException, status
+
+from core.routing import get_work_queues
+from schemas.dead_letters import DeadLettersReplayView, DeadLettersView
+from services.broker import BrokerService
+
+
+class DeadLettersService:
+    """A class for work with the dead letter queues."""
+
+    def __init__(
+        self,
+    ) -> None:
+        self.broker_service = BrokerService()
+
+    @staticmethod
+    def check_queue_name(queue_name: str) -> None:
+        """Checks the queue has a dead letter queue."""
+
+        if queue_name not in get_work_queues():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="An invalid queue name.",
+            )
+
+    async def get_dead_letters(self) -> list[DeadLettersView]:
+        """Gets the numbers of the dead messages of the queues."""
+
+        return [
+            DeadLettersView(
+                queue_name=queue_name,
+                message_count=(
+                    await self.broker_service.get_dead_messages_count(
+                        queue_name
+                    )
+                ),
+            )
+            for queue_name in get_work_queues()
+        ]
+
+    async def replay_dead_letters(
+        self, queue_name: str, limit: int
+    ) -> DeadLettersReplayView:
+        """Returns the dead messages to the queue."""
+
+        self.check_queue_name(queue_name)
+        replayed = await self.broker_service.replay_messages(
+            queue_name, limit=limit
+        )
+        return DeadLettersReplayView(queue_name=queue_name, replayed=replayed)
+
+
+@lru_cache()
+def get_dead_letters_service() -> DeadLettersService:
+    """DeadLettersService provider."""
+    return DeadLettersService()
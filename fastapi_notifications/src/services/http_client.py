@@ -0,0 +1,39 @@
+import httpx
+
+from core.config import config
+
+http_client: httpx.AsyncClient | None = None
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Creates a pooled http client for service-to-service calls."""
+
+    return httpx.AsyncClient(
+        http2=config.http.http2,
+        limits=httpx.Limits(
+            max_connections=config.http.max_connections,
+            max_keepalive_connections=config.http.max_keepalive_connections,
+            keepalive_expiry=config.http.keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(
+            config.http.timeout, connect=config.http.connect_timeout
+        ),
+    )
+
+
+async def get_http_client() -> httpx.AsyncClient:
+    """Gets the process-wide http client (creates it if needed)."""
+
+    global http_client
+    if http_client is None or http_client.is_closed:
+        http_client = create_http_client()
+    return http_client
+
+
+async def close_http_client() -> None:
+    """Closes the process-wide http client."""
+
+    global http_client
+    if http_client is not None:
+        await http_client.aclose()
+        http_client = None
@@ -1,27 +1,45 @@
 import json
+from collections import defaultdict
+from datetime import datetime, timedelta
 from functools import lru_cache
 from typing import Any
 from uuid import UUID
 
 from fastapi import HTTPException, status
 from fastapi.encoders import jsonable_encoder
+from sqlalchemy.exc import IntegrityError
 
-from core.constants import EXCHANGES, QUEUES
+from core.config import config
+from core.constants import EXCHANGES, QUEUES, STAGES
 from core.logger import log
+from core.routing import (
+    get_binding_key,
+    get_message_priority,
+    get_routing_key,
+)
 from db.postgres import get_db_session
 from db.redis import get_client
+from models.idempotency_key import IdempotencyKey
 from models.notification import Notification
+from models.outbox import OutboxMessage
+from schemas.idempotency_key import IdempotencyKeyCreateDto
 from schemas.notifications import (
+    NotificationCreateDBDto,
     NotificationCreateDto,
     NotificationDBView,
     NotificationTask,
     NotificationUpdateProfileDto,
     NotificationUpdateTimeDto,
 )
+from schemas.outbox import OutboxMessageCreateDto
 from services.broker import BrokerService
 from services.cache import CacheService
 from services.database import RepositoryDB
-from services.pagination import PaginationParams
+from services.pagination import (
+    KEYSET_SORTS,
+    CursorPaginationParams,
+    decode_cursor,
+)
 
 CACHE_EXPIRE_IN_SECONDS = 60 * 60 * 24
 
@@ -34,6 +52,8 @@ class NotificationsService:
     ) -> None:
         self.broker_service = BrokerService()
         self.repository_db = RepositoryDB(Notification)
+        self.outbox_repository_db = RepositoryDB(OutboxMessage)
+        self.idempotency_repository_db = RepositoryDB(IdempotencyKey)
         self.cache_service = CacheService()
 
     async def add_notification_task(
@@ -41,19 +61,266 @@ class NotificationsService:
         created_task: NotificationCreateDto,
         exchange_name: str = EXCHANGES.CREATED_TASKS,
         queue_name: str = QUEUES.CREATED_TASKS,
+        idempotency_key: str | None = None,
     ) -> NotificationDBView:
-        """Adds a notification task."""
+        """Adds a notification task (scheduled if `send_at` is ahead).
+
+        The task is published by the outbox relay. A repeated request
+        with the same `idempotency_key` returns the created notification.
+        """
+
+        if idempotency_key is not None:
+            notification = await self.get_idempotent_notification(
+                idempotency_key
+            )
+            if notification is not None:
+                log.info(
+                    f"\nThe notification {notification.id} already exists "
+                    f"(idempotency key: {idempotency_key}).\n"
+                )
+                return notification
 
         ### db write
-        notification = await self.create_notification(created_task)
+        try:
+            notification = await self.create_notification(
+                created_task, exchange_name, queue_name, idempotency_key
+            )
+        except IntegrityError:
+            # A concurrent request with the same key created it first
+            if idempotency_key is None:
+                raise
+            notification = await self.get_idempotent_notification(
+                idempotency_key
+            )
+            if notification is None:
+                raise
+            return notification
+
+        if idempotency_key is not None:
+            await self.put_to_cache(
+                self.get_idempotency_cache_key(idempotency_key),
+                notification,
+                NotificationDBView,
+                expire=config.globals.idempotency_ttl,
+            )
+        if notification.released_at is None:
+            log.info(
+                f"\nThe notification {notification.id} "
+                f"is scheduled at {notification.send_at}.\n"
+            )
+        return notification
 
-        notification_task = NotificationTask(**notification.model_dump())
-        await self.broker_service.add_message(
-            notification_task, exchange_name, queue_name
-        )
+    @staticmethod
+    def get_idempotency_cache_key(idempotency_key: str) -> str:
+        """Gets the cache key of the idempotency key."""
+
+        return f"idempotency:{idempotency_key}"
+
+    async def get_idempotent_notification(
+        self, idempotency_key: str
+    ) -> NotificationDBView | None:
+        """Gets the notification created with the idempotency key."""
+
+        cache_key = self.get_idempotency_cache_key(idempotency_key)
+        notification = await self.get_from_cache(cache_key, NotificationDBView)
+        if notification is not None:
+            return notification
+
+        async for db_session in get_db_session():
+            idempotency_key_db = await self.idempotency_repository_db.get_one(
+                db_session, idempotency_key
+            )
+            notification_db = None
+            if idempotency_key_db is not None:
+                notification_db = await self.repository_db.get_one(
+                    db_session, idempotency_key_db.notification_id
+                )
+        if notification_db is None:
+            return None
 
+        notification = NotificationDBView(**jsonable_encoder(notification_db))
+        await self.put_to_cache(
+            cache_key,
+            notification,
+            NotificationDBView,
+            expire=config.globals.idempotency_ttl,
+        )
         return notification
 
+    async def add_notification_tasks(
+        self,
+        created_tasks: list[NotificationCreateDto],
+        exchange_name: str = EXCHANGES.CREATED_TASKS,
+        queue_name: str = QUEUES.CREATED_TASKS,
+    ) -> list[NotificationDBView]:
+        """Adds a batch of notification tasks.
+
+        The tasks are published by the outbox relay.
+        """
+
+        ### db write
+        notifications = await self.create_notifications(
+            created_tasks, exchange_name, queue_name
+        )
+        return notifications
+
+    @staticmethod
+    def get_outbox_messages(
+        notifications: list[NotificationDBView],
+        exchange_name: str,
+        queue_name: str,
+    ) -> list[OutboxMessageCreateDto]:
+        """Gets the outbox messages of the notifications tasks."""
+
+        return [
+            OutboxMessageCreateDto(
+                exchange_name=exchange_name,
+                queue_name=queue_name,
+                payload=NotificationTask(
+                    **notification.model_dump()
+                ).model_dump_json(),
+            )
+            for notification in notifications
+        ]
+
+    async def publish_notifications(
+        self,
+        notifications_tasks: list[NotificationTask],
+        exchange_name: str = EXCHANGES.CREATED_TASKS,
+        queue_name: str = QUEUES.CREATED_TASKS,
+    ) -> list[NotificationTask]:
+        """Publishes the notifications tasks.
+
+        Returns the tasks confirmed by the broker.
+        """
+
+        if not notifications_tasks:
+            return []
+
+        return await self.broker_service.add_messages(
+            notifications_tasks,
+            exchange_name,
+            queue_name,
+            routing_key=lambda notification_task: get_routing_key(
+                STAGES.CREATED_TASKS,
+                notification_task.notification_type,
+                notification_task.priority,
+            ),
+            binding_key=get_binding_key(STAGES.CREATED_TASKS),
+            priority=lambda notification_task: get_message_priority(
+                notification_task.priority
+            ),
+        )
+
+    async def relay_outbox_messages(self, batch_size: int = 1_000) -> int:
+        """Publishes the outbox messages and deletes the confirmed ones.
+
+        The rows are locked with SKIP LOCKED, so several relays publish
+        different batches. Returns the number of the published messages.
+        """
+
+        relayed = 0
+        while True:
+            async for db_session in get_db_session():
+                outbox_messages = (
+                    await self.outbox_repository_db.get_many_for_update(
+                        db_session,
+                        conditions=[],
+                        sort="id",
+                        limit=batch_size,
+                    )
+                )
+
+                # {(exchange_name, queue_name): {outbox_id: task}}
+                batches = defaultdict(dict)
+                for outbox_message in outbox_messages:
+                    key = (
+                        outbox_message.exchange_name,
+                        outbox_message.queue_name,
+                    )
+                    batches[key][outbox_message.id] = (
+                        NotificationTask.model_validate_json(
+                            outbox_message.payload
+                        )
+                    )
+
+                published_ids = []
+                for (exchange_name, queue_name), batch in batches.items():
+                    notifications_tasks = await self.publish_notifications(
+                        list(batch.values()), exchange_name, queue_name
+                    )
+                    confirmed = {id(task) for task in notifications_tasks}
+                    published_ids.extend(
+                        outbox_id
+                        for outbox_id, task in batch.items()
+                        if id(task) in confirmed
+                    )
+
+                # The locks are released with the commit
+                await self.outbox_repository_db.delete_many(
+                    db_session, ids=published_ids
+                )
+
+            relayed += len(published_ids)
+            # The last batch or the broker did not confirm the messages
+            if len(outbox_messages) < batch_size:
+                return relayed
+            if len(published_ids) < len(outbox_messages):
+                return relayed
+
+    async def release_due_notifications(
+        self,
+        batch_size: int = 1_000,
+        exchange_name: str = EXCHANGES.CREATED_TASKS,
+        queue_name: str = QUEUES.CREATED_TASKS,
+    ) -> int:
+        """Moves the scheduled notifications which are due to the outbox.
+
+        The due rows are locked with SKIP LOCKED, so several schedulers
+        release different batches. Returns the number of released tasks.
+        """
+
+        released = 0
+        while True:
+            async for db_session in get_db_session():
+                notifications_db = (
+                    await self.repository_db.get_many_for_update(
+                        db_session,
+                        conditions=[
+                            Notification.released_at.is_(None),
+                            Notification.send_at.is_not(None),
+                            Notification.send_at <= datetime.utcnow(),
+                        ],
+                        sort="send_at",
+                        limit=batch_size,
+                    )
+                )
+                notifications = [
+                    NotificationDBView(**jsonable_encoder(notification))
+                    for notification in notifications_db
+                ]
+                await self.outbox_repository_db.create_many(
+                    db_session,
+                    objs_in=self.get_outbox_messages(
+                        notifications, exchange_name, queue_name
+                    ),
+                    commit=False,
+                )
+
+                # The outbox messages are committed with the release time
+                released_at = datetime.utcnow()
+                await self.repository_db.update_many(
+                    db_session,
+                    rows=[
+                        {"id": notification.id, "released_at": released_at}
+                        for notification in notifications
+                    ],
+                )
+
+            released += len(notifications)
+            if len(notifications) < batch_size:
+                return released
+
     async def get_from_cache(
         self, key: str, schema: Any, is_list: bool = False
     ) -> Any:
@@ -93,13 +360,40 @@ class NotificationsService:
                 client, key, serialized_data, expire=expire
             )
 
+    async def get_many_from_cache(
+        self, keys: list[str], schema: Any
+    ) -> list[Any]:
+        """Get data of the keys from cache (None for the missing keys)."""
+
+        async for client in get_client():
+            data = await self.cache_service.get_many(client, keys)
+            return [
+                schema.parse_raw(item) if item else None for item in data
+            ]
+
+    async def put_many_to_cache(
+        self,
+        data: dict[str, Any],
+        expire: int = CACHE_EXPIRE_IN_SECONDS,
+    ) -> None:
+        """Put data of the keys in cache."""
+
+        async for client in get_client():
+            serialized_data = {key: item.json() for key, item in data.items()}
+            await self.cache_service.set_many(
+                client, serialized_data, expire=expire
+            )
+
     async def get_notifications(
         self,
         sort: str,
-        pagination: PaginationParams,
+        pagination: CursorPaginationParams,
     ) -> list[NotificationDBView]:
         """Gets a paginated list of the notifications."""
 
+        if pagination.cursor is not None:
+            return await self.get_notifications_by_cursor(sort, pagination)
+
         async for db_session in get_db_session():
             skip = (pagination.page_number - 1) * pagination.page_size
             limit = pagination.page_size
@@ -116,10 +410,15 @@ class NotificationsService:
         self,
         user_id: str | UUID,
         sort: str,
-        pagination: PaginationParams,
+        pagination: CursorPaginationParams,
     ) -> list[NotificationDBView]:
         """Gets a paginated list of the user notifications."""
 
+        if pagination.cursor is not None:
+            return await self.get_notifications_by_cursor(
+                sort, pagination, conditions=[Notification.user_id == user_id]
+            )
+
         async for db_session in get_db_session():
             skip = (pagination.page_number - 1) * pagination.page_size
             limit = pagination.page_size
@@ -139,6 +438,53 @@ class NotificationsService:
         ]
         return notifications
 
+    async def get_notifications_by_cursor(
+        self,
+        sort: str,
+        pagination: CursorPaginationParams,
+        conditions: list[Any] | None = None,
+    ) -> list[NotificationDBView]:
+        """Gets the page of the notifications after the cursor.
+
+        Unlike the page number, the cursor does not make the deep pages
+        slower (the index on the sort field is used instead of OFFSET).
+        """
+
+        if sort not in KEYSET_SORTS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"The cursor supports the sorts: {KEYSET_SORTS}.",
+            )
+
+        cursor = None
+        if pagination.cursor is not None:
+            cursor = decode_cursor(pagination.cursor)
+        async for db_session in get_db_session():
+            notifications_db = await self.repository_db.get_many_by_keyset(
+                db_session,
+                conditions=conditions,
+                sort=sort,
+                cursor=cursor,
+                limit=pagination.page_size,
+            )
+        notifications = [
+            NotificationDBView(**jsonable_encoder(notification))
+            for notification in notifications_db
+        ]
+        return notifications
+
+    async def get_unsent_notifications(
+        self,
+        pagination: CursorPaginationParams,
+    ) -> list[NotificationDBView]:
+        """Gets the page of the unsent notifications (the oldest first)."""
+
+        return await self.get_notifications_by_cursor(
+            "created_at",
+            pagination,
+            conditions=[Notification.last_sent_at.is_(None)],
+        )
+
     async def get_notification(
         self,
         notification_id: str | UUID,
@@ -159,19 +505,109 @@ class NotificationsService:
         notification = NotificationDBView(**jsonable_encoder(notification_db))
         return notification
 
+    async def delete_expired_idempotency_keys(self, ttl: int) -> int:
+        """Deletes the idempotency keys older than the ttl (seconds)."""
+
+        expired_at = datetime.utcnow() - timedelta(seconds=ttl)
+        repository_db = self.idempotency_repository_db
+        async for db_session in get_db_session():
+            deleted = await repository_db.delete_many_with_conditions(
+                db_session,
+                conditions=[IdempotencyKey.created_at < expired_at],
+            )
+        return deleted
+
+    @staticmethod
+    def get_create_data(
+        notification_data: NotificationCreateDto,
+    ) -> NotificationCreateDBDto:
+        """Gets the notification data to store.
+
+        A notification is released at once unless it is scheduled ahead.
+        """
+
+        now = datetime.utcnow()
+        send_at = notification_data.send_at
+        return NotificationCreateDBDto(
+            **notification_data.model_dump(),
+            released_at=None if send_at is not None and send_at > now else now,
+        )
+
     async def create_notification(
         self,
         notification_data: NotificationCreateDto,
+        exchange_name: str = EXCHANGES.CREATED_TASKS,
+        queue_name: str = QUEUES.CREATED_TASKS,
+        idempotency_key: str | None = None,
     ) -> NotificationDBView:
         """Creates a notification."""
 
+        notifications = await self.create_notifications(
+            [notification_data],
+            exchange_name,
+            queue_name,
+            idempotency_keys=[idempotency_key],
+        )
+        return notifications[0]
+
+    async def create_notifications(
+        self,
+        notifications_data: list[NotificationCreateDto],
+        exchange_name: str = EXCHANGES.CREATED_TASKS,
+        queue_name: str = QUEUES.CREATED_TASKS,
+        idempotency_keys: list[str | None] | None = None,
+    ) -> list[NotificationDBView]:
+        """Creates a batch of notifications.
+
+        The outbox messages of the released notifications and
+        the idempotency keys are written in the same transaction.
+        """
+
+        if idempotency_keys is None:
+            idempotency_keys = [None] * len(notifications_data)
+
         async for db_session in get_db_session():
-            notification_db = await self.repository_db.create(
+            notifications_db = await self.repository_db.create_many(
                 db_session,
-                obj_in=notification_data,
+                objs_in=[
+                    self.get_create_data(notification_data)
+                    for notification_data in notifications_data
+                ],
+                commit=False,
             )
-        notification = NotificationDBView(**jsonable_encoder(notification_db))
-        return notification
+            notifications = [
+                NotificationDBView(**jsonable_encoder(notification))
+                for notification in notifications_db
+            ]
+            await self.outbox_repository_db.create_many(
+                db_session,
+                objs_in=self.get_outbox_messages(
+                    [
+                        notification
+                        for notification in notifications
+                        if notification.released_at is not None
+                    ],
+                    exchange_name,
+                    queue_name,
+                ),
+                commit=False,
+            )
+            # A duplicate key fails the transaction (IntegrityError)
+            await self.idempotency_repository_db.create_many(
+                db_session,
+                objs_in=[
+                    IdempotencyKeyCreateDto(
+                        id=idempotency_key, notification_id=notification.id
+                    )
+                    for notification, idempotency_key in zip(
+                        notifications, idempotency_keys
+                    )
+                    if idempotency_key is not None
+                ],
+                commit=False,
+            )
+            await db_session.commit()
+        return notifications
 
     async def update_notification(
         self,
@@ -211,6 +647,21 @@ class NotificationsService:
         )
         return notification
 
+    async def update_notifications_sent_time(
+        self,
+        timestamps: dict[UUID, datetime],
+    ) -> None:
+        """Updates the last sent time of the notifications by ids."""
+
+        async for db_session in get_db_session():
+            await self.repository_db.update_many(
+                db_session,
+                rows=[
+                    {"id": notification_id, "last_sent_at": timestamp}
+                    for notification_id, timestamp in timestamps.items()
+                ],
+            )
+
     async def delete_notification(
         self,
         notification_id: str | UUID,
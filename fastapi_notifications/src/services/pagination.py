@@ -1,5 +1,15 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from fastapi import HTTPException, status
 from pydantic import BaseModel, Field
 
+# The sorts supported by the cursor pagination
+KEYSET_SORTS = ("created_at", "-created_at")
+
 
 class PaginationParams(BaseModel):
     """A class for work with pagination parameters."""
@@ -14,3 +24,45 @@ class PaginationParams(BaseModel):
         description="The page number.",
         ge=1,
     )
+
+
+class CursorPaginationParams(PaginationParams):
+    """A class for work with pagination parameters including a cursor."""
+
+    cursor: str | None = Field(
+        default=None,
+        description=(
+            "The cursor of the page (the X-Next-Cursor header "
+            "of the previous page), the page number is ignored."
+        ),
+    )
+
+
+def encode_cursor(created_at: datetime, id_: UUID) -> str:
+    """Encodes the opaque cursor of the item."""
+
+    data = json.dumps([created_at.isoformat(), str(id_)])
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decodes the opaque cursor into the item created time and id."""
+
+    try:
+        created_at, id_ = json.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(created_at), UUID(id_)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="An invalid cursor.",
+        )
+
+
+def get_next_cursor(
+    items: list[Any], sort: str | None, page_size: int
+) -> str | None:
+    """Gets the cursor of the next page (None for the last page)."""
+
+    if sort not in KEYSET_SORTS or len(items) < page_size:
+        return None
+    return encode_cursor(items[-1].created_at, items[-1].id)
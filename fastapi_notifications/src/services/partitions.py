@@ -0,0 +1,191 @@
+import time
+from datetime import date, datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.logger import log
+from db.partitions import (
+    add_months,
+    get_create_partition_sql,
+    get_default_partition_name,
+    get_month_start,
+    get_partition_month,
+    get_partition_name,
+)
+from db.postgres import get_db_session
+from models.notification import Notification
+
+
+class PartitionsService:
+    """A class for work with the monthly partitions of a table."""
+
+    def __init__(self, table_name: str = Notification.__tablename__) -> None:
+        self.table_name = table_name
+
+    async def get_partitions(self, db_session: AsyncSession) -> list[str]:
+        """Gets the names of the attached partitions."""
+
+        results = await db_session.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE parent.relname = :table_name"
+            ),
+            {"table_name": self.table_name},
+        )
+        return list(results.scalars().all())
+
+    async def get_default_months(self, db_session: AsyncSession) -> list[date]:
+        """Gets the months of the rows in the default partition."""
+
+        default_name = get_default_partition_name(self.table_name)
+        results = await db_session.execute(
+            text(
+                f"SELECT DISTINCT date_trunc('month', created_at) "
+                f'FROM "{default_name}"'
+            )
+        )
+        return [get_month_start(value) for value in results.scalars().all()]
+
+    async def create_partitions(self, months_ahead: int) -> list[str]:
+        """Creates the partitions of the current and the next months.
+
+        The partitions of the rows in the default partition (written
+        while the maintenance was behind) are created too and the rows
+        are moved there. Returns the names of the created partitions.
+        """
+
+        month = get_month_start(datetime.utcnow())
+        created = []
+        async for db_session in get_db_session():
+            partitions = set(await self.get_partitions(db_session))
+            default_months = await self.get_default_months(db_session)
+            if default_months:
+                log.error(
+                    f"Partitions: The default partition has the rows "
+                    f"of the months {default_months}, they are moved."
+                )
+
+            months = {add_months(month, i) for i in range(months_ahead + 1)}
+            for partition_month in sorted(months | set(default_months)):
+                partition_name = get_partition_name(
+                    self.table_name, partition_month
+                )
+                if partition_name in partitions:
+                    continue
+
+                if partition_month in default_months:
+                    # The parent table is locked (ACCESS EXCLUSIVE)
+                    # until the rows are moved
+                    log.warning(
+                        f"Partitions: Moving the rows of {partition_month} "
+                        f"from the default partition, the table "
+                        f"{self.table_name} is locked."
+                    )
+                    started_at = time.monotonic()
+                    await self.create_default_rows_partition(
+                        db_session, partition_month
+                    )
+                else:
+                    await db_session.execute(
+                        text(
+                            get_create_partition_sql(
+                                self.table_name, partition_month
+                            )
+                        )
+                    )
+                await db_session.commit()
+                if partition_month in default_months:
+                    log.warning(
+                        f"Partitions: The rows of {partition_month} moved, "
+                        f"the table {self.table_name} was locked for "
+                        f"{time.monotonic() - started_at:.1f}s."
+                    )
+                created.append(partition_name)
+                log.info(f"\nThe partition {partition_name} is created.\n")
+        return created
+
+    async def create_default_rows_partition(
+        self, db_session: AsyncSession, month: date
+    ) -> None:
+        """Creates the partition of the month having rows in the default.
+
+        The partition can't be created while the default partition has
+        its rows: the default is detached, the rows are moved and the
+        default is attached back in the session transaction.
+        """
+
+        default_name = get_default_partition_name(self.table_name)
+        bounds = {"start": month, "end": add_months(month, 1)}
+        condition = "created_at >= :start AND created_at < :end"
+        await db_session.execute(
+            text(
+                f'ALTER TABLE "{self.table_name}" '
+                f'DETACH PARTITION "{default_name}"'
+            )
+        )
+        await db_session.execute(
+            text(get_create_partition_sql(self.table_name, month))
+        )
+        await db_session.execute(
+            text(
+                f'INSERT INTO "{self.table_name}" '
+                f'SELECT * FROM "{default_name}" WHERE {condition}'
+            ),
+            bounds,
+        )
+        await db_session.execute(
+            text(f'DELETE FROM "{default_name}" WHERE {condition}'),
+            bounds,
+        )
+        await db_session.execute(
+            text(
+                f'ALTER TABLE "{self.table_name}" '
+                f'ATTACH PARTITION "{default_name}" DEFAULT'
+            )
+        )
+
+    async def drop_partitions(
+        self, retention_months: int, drop_detached: bool = False
+    ) -> list[str]:
+        """Detaches the partitions older than the retention (months).
+
+        The detached partitions are kept (e.g. to archive them) unless
+        `drop_detached` is True. Returns their names.
+        """
+
+        expired_at = add_months(
+            get_month_start(datetime.utcnow()), -retention_months
+        )
+        detached = []
+        async for db_session in get_db_session():
+            for partition_name in await self.get_partitions(db_session):
+                partition_month = get_partition_month(
+                    self.table_name, partition_name
+                )
+                # The default partition is never detached
+                if partition_month is None:
+                    continue
+                if add_months(partition_month, 1) > expired_at:
+                    continue
+
+                await db_session.execute(
+                    text(
+                        f'ALTER TABLE "{self.table_name}" '
+                        f'DETACH PARTITION "{partition_name}"'
+                    )
+                )
+                if drop_detached:
+                    await db_session.execute(
+                        text(f'DROP TABLE "{partition_name}"')
+                    )
+                await db_session.commit()
+                detached.append(partition_name)
+                log.info(
+                    f"\nThe partition {partition_name} is detached "
+                    f"(dropped: {drop_detached}).\n"
+                )
+        return detached
+
@@ -0,0 +1,190 @@
+from functools import lru_cache
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+
+from core.logger import log
+from db.postgres import get_db_session
+from db.redis import get_client
+from models.template import Template
+from schemas.templates import (
+    TemplateCreateDto,
+    TemplateDBView,
+    TemplateUpdateDto,
+)
+from services.cache import CacheService
+from services.database import RepositoryDB
+from services.pagination import PaginationParams
+
+CACHE_EXPIRE_IN_SECONDS = 60 * 60 * 24
+# Changed on any template change to reset the senders compiled templates
+VERSION_KEY = "templates:version"
+
+
+class TemplatesService:
+    """A class for work with notifications templates."""
+
+    def __init__(
+        self,
+    ) -> None:
+        self.repository_db = RepositoryDB(Template)
+        self.cache_service = CacheService()
+
+    @staticmethod
+    def get_cache_key(template_id: str | UUID) -> str:
+        return f"template:{template_id}"
+
+    async def invalidate_cache(self, template_id: str | UUID) -> None:
+        """Deletes the template from cache and changes the version."""
+
+        async for client in get_client():
+            await self.cache_service.delete(
+                client, self.get_cache_key(template_id)
+            )
+            await self.cache_service.incr(client, VERSION_KEY)
+
+    async def get_version(self) -> int:
+        """Gets the version of the templates."""
+
+        async for client in get_client():
+            version = await self.cache_service.get(client, VERSION_KEY)
+        return int(version or 0)
+
+    async def get_template_source(
+        self,
+        template_id: str | UUID,
+    ) -> TemplateDBView | None:
+        """Gets the template by id from cache or the database."""
+
+        key = self.get_cache_key(template_id)
+        async for client in get_client():
+            data = await self.cache_service.get(client, key)
+            if data:
+                return TemplateDBView.model_validate_json(data)
+
+        async for db_session in get_db_session():
+            template_db = await self.repository_db.get_one(
+                db_session,
+                id=template_id,
+            )
+        if template_db is None:
+            return None
+
+        template = TemplateDBView(**jsonable_encoder(template_db))
+        async for client in get_client():
+            await self.cache_service.set(
+                client,
+                key,
+                template.model_dump_json(),
+                expire=CACHE_EXPIRE_IN_SECONDS,
+            )
+        return template
+
+    async def get_templates(
+        self,
+        sort: str,
+        pagination: PaginationParams,
+    ) -> list[TemplateDBView]:
+        """Gets a paginated list of the templates."""
+
+        async for db_session in get_db_session():
+            skip = (pagination.page_number - 1) * pagination.page_size
+            limit = pagination.page_size
+            templates_db = await self.repository_db.get_many(
+                db_session, sort=sort, skip=skip, limit=limit
+            )
+        templates = [
+            TemplateDBView(**jsonable_encoder(template))
+            for template in templates_db
+        ]
+        return templates
+
+    async def get_template(
+        self,
+        template_id: str | UUID,
+    ) -> TemplateDBView:
+        """Gets the template by id."""
+
+        template = await self.get_template_source(template_id)
+        if template is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="An invalid template id.",
+            )
+        return template
+
+    async def create_template(
+        self,
+        template_data: TemplateCreateDto,
+    ) -> TemplateDBView:
+        """Creates a template."""
+
+        async for db_session in get_db_session():
+            template_db = await self.repository_db.create(
+                db_session,
+                obj_in=template_data,
+            )
+        # The template may be cached as not found
+        await self.invalidate_cache(template_db.id)
+
+        template = TemplateDBView(**jsonable_encoder(template_db))
+        return template
+
+    async def update_template(
+        self,
+        template_id: str | UUID,
+        template_data: TemplateUpdateDto,
+    ) -> TemplateDBView:
+        """Updates the template by id."""
+
+        async for db_session in get_db_session():
+            template_db = await self.repository_db.get_one(
+                db_session,
+                id=template_id,
+            )
+            if template_db is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="An invalid template id.",
+                )
+            log.debug(f"\ntemplate_db.as_dict: \n{template_db.as_dict()}")
+
+            template_db.name = template_data.name
+            template_db.body = template_data.body
+            updated_template_db = await self.repository_db.update(
+                db_session, db_obj=template_db
+            )
+        await self.invalidate_cache(template_id)
+
+        template = TemplateDBView(**jsonable_encoder(updated_template_db))
+        return template
+
+    async def delete_template(
+        self,
+        template_id: str | UUID,
+    ) -> None:
+        """Deletes the template by id."""
+
+        async for db_session in get_db_session():
+            template_db = await self.repository_db.get_one(
+                db_session,
+                id=template_id,
+            )
+            if template_db is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="An invalid template id.",
+                )
+
+            result = await self.repository_db.delete(
+                db_session, db_obj=template_db
+            )
+        await self.invalidate_cache(template_id)
+        return result
+
+
+@lru_cache()
+def get_templates_service() -> TemplatesService:
+    """TemplatesService provider."""
+    return TemplatesService()
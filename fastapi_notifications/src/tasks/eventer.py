@@ -19,8 +19,9 @@ async def events_generator() -> None:
     ]
 
     notifications_service = NotificationsService()
-    for created_task in notifications_tasks_created:
-        await notifications_service.add_notification_task(created_task)
+    await notifications_service.add_notification_tasks(
+        notifications_tasks_created
+    )
 
 
 async def get_events() -> None:
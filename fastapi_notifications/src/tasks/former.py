@@ -1,88 +1,201 @@
 import asyncio
 import json
+import time
+from functools import lru_cache, partial
+from uuid import UUID
 
 import httpx
-from aio_pika import connect_robust
+from aio_pika.abc import AbstractConnection
 from celery import shared_task
+from pydantic import ValidationError
 
 from core.config import config
-from core.constants import EXCHANGES, QUEUES
+from core.constants import EXCHANGES, LEGACY_CREATED_QUEUE, QUEUES, STAGES
 from core.logger import log
+from core.routing import (
+    get_binding_key,
+    get_channel,
+    get_channel_queue,
+    get_message_priority,
+    get_routing_key,
+)
 from schemas.access import UserAccess
 from schemas.notifications import (
     NotificationTask,
     NotificationUpdateProfileDto,
 )
 from schemas.user import UserAuth
-from services.broker import BrokerService
+from services.broker import BrokerService, RejectedMessageError
+from services.http_client import close_http_client, get_http_client
 from services.notifications import NotificationsService
+from tasks.former_tools.access_token import (
+    AccessTokenProvider,
+    get_token_expire_time,
+)
+from tasks.former_tools.profile_cache import get_profile_cache
+from tasks.former_tools.profile_loader import ProfileLoader
 
 
 async def get_access_token():
     """Gets an access token."""
 
-    async with httpx.AsyncClient() as client:
-        url = f"{config.globals.url_auth_login}"
-        json_data = {"login": "admin", "password": "admin"}
-        response = await client.post(url=url, json=json_data)
+    client = await get_http_client()
+    url = f"{config.globals.url_auth_login}"
+    json_data = {"login": "admin", "password": "admin"}
+    response = await client.post(url=url, json=json_data)
 
-        users_access_token = response.cookies.get("users_access_token")
-        admin_access = UserAccess(users_access_token=users_access_token)
+    users_access_token = response.cookies.get("users_access_token")
+    admin_access = UserAccess(users_access_token=users_access_token)
 
-        notifications_service = NotificationsService()
-        await notifications_service.put_to_cache(
-            "admin_token", admin_access, UserAccess, 29 * 60
-        )
-        return admin_access
+    notifications_service = NotificationsService()
+    await notifications_service.put_to_cache(
+        "admin_token", admin_access, UserAccess, 29 * 60
+    )
+    return admin_access
 
 
-async def get_profile_data(
-    access_data: UserAccess,
-    notification_task: NotificationTask,
-) -> NotificationTask:
-    """Gets the user profile data."""
+async def refresh_access_data() -> UserAccess:
+    """Gets the admin access data from cache or the auth service.
+
+    The cached token is skipped if it is about to expire.
+    """
+
+    notifications_service = NotificationsService()
+    access_data = await notifications_service.get_from_cache(
+        "admin_token", UserAccess
+    )
+    if access_data is not None:
+        expire_time = get_token_expire_time(access_data.users_access_token)
+        if expire_time - time.time() > config.globals.token_refresh_margin:
+            return access_data
+
+    access_data = await get_access_token()
+    return access_data
+
+
+@lru_cache()
+def get_access_token_provider() -> AccessTokenProvider:
+    """AccessTokenProvider provider (one provider per process)."""
+    return AccessTokenProvider(
+        refresh_access_data,
+        refresh_margin=config.globals.token_refresh_margin,
+    )
+
+
+async def get_profiles_data(user_ids: list[UUID]) -> dict[UUID, UserAuth]:
+    """Gets the users profiles data with one request.
+
+    An auth service failure is raised to retry the messages, only
+    the users missing in a successful response (or with an invalid
+    profile) are not found.
+    """
+
+    access_data = await get_access_token_provider().get()
 
     log.info(
-        f"\n{__name__}: {get_profile_data.__name__}: \n"
-        f"access_data: {access_data.model_dump()}\n"
+        f"\n{__name__}: {get_profiles_data.__name__}: \n"
+        f"user_ids: {user_ids}\n"
     )
 
-    user_id = notification_task.user_id
-    url = f"{config.globals.url_auth_users}/{user_id}"
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url=url, cookies=access_data.model_dump())
-        profile = response.content
+    url = f"{config.globals.url_auth_users}/batch"
+    json_data = {"ids": [str(user_id) for user_id in user_ids]}
+    client = await get_http_client()
+    response = await client.post(
+        url=url, json=json_data, cookies=access_data.model_dump()
+    )
 
     if response.status_code != 200:
-        return None
+        log.error(
+            f"\n{__name__}: {get_profiles_data.__name__}: \n"
+            f"status: {response.status_code}, response: {response.text}\n"
+        )
+        response.raise_for_status()
+        raise httpx.HTTPStatusError(
+            f"Unexpected status: {response.status_code}",
+            request=response.request,
+            response=response,
+        )
 
-    log.info(
-        f"\n{__name__}: {get_profile_data.__name__}: \n"
-        f"profile: {profile}\n"
+    profiles = {}
+    for profile_data in response.json():
+        # An invalid profile fails only the notifications of its user
+        try:
+            profile = UserAuth(**profile_data)
+        except ValidationError as err:
+            log.warning(
+                f"The profile of the user (id={profile_data.get('id')}) "
+                f"is invalid: {err}"
+            )
+            continue
+        profiles[profile.id] = profile
+    return profiles
+
+
+async def get_shared_profiles_data(
+    user_ids: list[UUID],
+) -> dict[UUID, UserAuth]:
+    """Gets the users profiles data from redis or the auth service."""
+
+    if not config.globals.profiles_redis_cache:
+        return await get_profiles_data(user_ids)
+
+    notifications_service = NotificationsService()
+    cached_profiles = await notifications_service.get_many_from_cache(
+        [f"profile:{user_id}" for user_id in user_ids], UserAuth
+    )
+    profiles = {
+        user_id: profile
+        for user_id, profile in zip(user_ids, cached_profiles)
+        if profile is not None
+    }
+
+    missing_user_ids = [
+        user_id for user_id in user_ids if user_id not in profiles
+    ]
+    if missing_user_ids:
+        fetched_profiles = await get_profiles_data(missing_user_ids)
+        if fetched_profiles:
+            await notifications_service.put_many_to_cache(
+                {
+                    f"profile:{user_id}": profile
+                    for user_id, profile in fetched_profiles.items()
+                },
+                config.globals.profiles_cache_ttl,
+            )
+        profiles.update(fetched_profiles)
+    return profiles
+
+
+def get_profile_loader() -> ProfileLoader:
+    """ProfileLoader provider."""
+
+    return ProfileLoader(
+        get_shared_profiles_data,
+        max_batch_size=config.globals.profiles_batch_size,
+        batch_window=config.globals.profiles_batch_window,
     )
-    return profile
 
 
 async def update_profile_data(
     notification_task: NotificationTask,
+    profile_loader: ProfileLoader,
 ) -> NotificationTask | None:
     """Updates notification task with the user profile data."""
 
-    notifications_service = NotificationsService()
-    access_data = await notifications_service.get_from_cache(
-        "admin_token", UserAccess
-    )
-    if access_data is None:
-        access_data = await get_access_token()
-
-    profile_response = await get_profile_data(access_data, notification_task)
-    if profile_response:
-        profile = UserAuth(**json.loads(profile_response))
-
+    user_id = notification_task.user_id
+    profile_cache = get_profile_cache()
+    profile = profile_cache.get(user_id)
+    if profile is None:
+        profile = await profile_loader.load(user_id)
+        if profile:
+            profile_cache.set(user_id, profile)
+
+    if profile:
         notification_update = NotificationUpdateProfileDto(
             user_name=profile.first_name, user_email=profile.email
         )
 
+        notifications_service = NotificationsService()
         notification = await notifications_service.update_notification(
             notification_task.id, notification_update
         )
@@ -93,16 +206,23 @@ async def update_profile_data(
     return None
 
 
-async def form_task(message: str) -> None:
-    """Forms notification task."""
+async def form_task(
+    message: str,
+    broker_service: BrokerService,
+    connection: AbstractConnection,
+    profile_loader: ProfileLoader,
+) -> None:
+    """Forms notification task.
+
+    The formed task is published through the consumer connection
+    to the queue of its delivery channel.
+    """
 
     log.info(f"\n{__name__}: {form_task.__name__}: \nmessage: {message}\n")
-    broker_service_temp = BrokerService()
-    connection_temp = await connect_robust(config.broker.connection)
     notification_task_created = NotificationTask(**json.loads(message))
 
     notification_task_updated = await update_profile_data(
-        notification_task_created
+        notification_task_created, profile_loader
     )
     if notification_task_updated:
         log.info(
@@ -111,29 +231,107 @@ async def form_task(message: str) -> None:
             f"{notification_task_updated.model_dump()}\n"
         )
 
-        async with connection_temp:
-            await broker_service_temp.publish(
-                connection_temp,
-                EXCHANGES.FORMED_TASKS,
-                QUEUES.FORMED_TASKS,
-                notification_task_updated,
-            )
+        notification_type = notification_task_updated.notification_type
+        channel = get_channel(notification_type)
+        await broker_service.publish(
+            connection,
+            EXCHANGES.FORMED_TASKS,
+            get_channel_queue(QUEUES.FORMED_TASKS, channel),
+            notification_task_updated,
+            routing_key=get_routing_key(
+                STAGES.FORMED_TASKS,
+                notification_type,
+                notification_task_updated.priority,
+            ),
+            binding_key=get_binding_key(STAGES.FORMED_TASKS, channel),
+            priority=get_message_priority(notification_task_updated.priority),
+        )
     else:
         log.warning(
-            f"The user (id={notification_task_created.user_id}) not found"
+            f"The user (id={notification_task_created.user_id}) not found "
+            f"or invalid"
+        )
+        # Retries will not help, the message goes to the dead letter queue
+        raise RejectedMessageError(
+            f"The user (id={notification_task_created.user_id}) not found "
+            f"or invalid"
         )
 
 
+def get_created_routing_key(message_body: bytes) -> str:
+    """Gets the routing key of the created notification message."""
+
+    notification_task = NotificationTask.model_validate_json(message_body)
+    return get_routing_key(
+        STAGES.CREATED_TASKS,
+        notification_task.notification_type,
+        notification_task.priority,
+    )
+
+
+async def retire_created_queue(broker_service: BrokerService) -> None:
+    """Moves the messages of the legacy created queue to the new one."""
+
+    await broker_service.retire_queue(
+        EXCHANGES.CREATED_TASKS,
+        LEGACY_CREATED_QUEUE,
+        get_created_routing_key,
+        target_queues={
+            QUEUES.CREATED_TASKS: get_binding_key(STAGES.CREATED_TASKS)
+        },
+    )
+
+
 async def form_tasks() -> None:
     """Forms notifications tasks."""
 
     broker_service = BrokerService()
-    await broker_service.get_messages(
-        EXCHANGES.CREATED_TASKS,
-        QUEUES.CREATED_TASKS,
-        form_task,
-        batch_size=1_000,
-    )
+    try:
+        await retire_created_queue(broker_service)
+        async with broker_service.get_connection() as connection:
+            await broker_service.consume(
+                connection,
+                EXCHANGES.CREATED_TASKS,
+                QUEUES.CREATED_TASKS,
+                partial(
+                    form_task,
+                    broker_service=broker_service,
+                    connection=connection,
+                    profile_loader=get_profile_loader(),
+                ),
+                batch_size=1_000,
+                concurrency=config.globals.former_concurrency,
+                binding_key=get_binding_key(STAGES.CREATED_TASKS),
+            )
+    finally:
+        await broker_service.close_connection_pool()
+        await close_http_client()
+        log.info(f"Former: profile cache: {get_profile_cache().stats()}")
+
+
+async def listen_tasks() -> None:
+    """Forms notifications tasks for the life of the process."""
+
+    broker_service = BrokerService()
+    try:
+        await retire_created_queue(broker_service)
+        async with broker_service.get_connection() as connection:
+            await broker_service.consume_forever(
+                connection,
+                EXCHANGES.CREATED_TASKS,
+                QUEUES.CREATED_TASKS,
+                partial(
+                    form_task,
+                    broker_service=broker_service,
+                    connection=connection,
+                    profile_loader=get_profile_loader(),
+                ),
+                concurrency=config.globals.former_concurrency,
+                binding_key=get_binding_key(STAGES.CREATED_TASKS),
+            )
+    finally:
+        await broker_service.close_connection_pool()
+        await close_http_client()
 
 
 async def former_main() -> None:
@@ -154,3 +352,8 @@ def former_task(self, name: str, do_tasks: bool = False) -> None:
         asyncio.run(former_main())
 
     log.info(f"\n\n{'-'*30}\n")
+
+
+if __name__ == "__main__":
+    # The persistent former (RABBITMQ_PERSISTENT_CONSUMERS=True)
+    asyncio.run(listen_tasks())
@@ -0,0 +1,87 @@
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from jose import JWTError, jwt
+
+from core.logger import log
+from schemas.access import UserAccess
+
+ACCESS_TOKEN_DEFAULT_TTL = 29 * 60
+
+
+def get_token_expire_time(token: str) -> float:
+    """Returns the token expiration timestamp taken from the `exp` claim."""
+
+    try:
+        expire = jwt.get_unverified_claims(token).get("exp")
+    except JWTError:
+        expire = None
+    if not expire:
+        return time.time() + ACCESS_TOKEN_DEFAULT_TTL
+    return float(expire)
+
+
+class AccessTokenProvider:
+    """A class for single-flight refreshing of the admin access token.
+
+    Concurrent callers share one refresh; the token is refreshed
+    in the background `refresh_margin` seconds before it expires.
+    """
+
+    def __init__(
+        self,
+        refresh_func: Callable[[], Awaitable[UserAccess]],
+        refresh_margin: float = 60,
+    ) -> None:
+        self._refresh_func = refresh_func
+        self._refresh_margin = refresh_margin
+        self._access_data: UserAccess | None = None
+        self._expires_at = 0.0
+        self._refresh_task: asyncio.Task | None = None
+
+    async def get(self) -> UserAccess:
+        """Gets the admin access data."""
+
+        now = time.time()
+        if self._access_data is not None and now < self._expires_at:
+            if now >= self._expires_at - self._refresh_margin:
+                # Proactive refresh, the current token is still valid
+                self.start_refresh()
+            return self._access_data
+
+        return await asyncio.shield(self.start_refresh())
+
+    def start_refresh(self) -> asyncio.Task:
+        """Starts the refresh unless it is already in progress."""
+
+        task = self._refresh_task
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.create_task(self.refresh())
+            task.add_done_callback(self.log_refresh_error)
+            self._refresh_task = task
+        return task
+
+    @staticmethod
+    def log_refresh_error(task: asyncio.Task) -> None:
+        """Logs the refresh error (also for the background refresh)."""
+
+        if not task.cancelled() and task.exception() is not None:
+            log.error(
+                f"AccessTokenProvider: An error while refreshing: "
+                f"{task.exception()}"
+            )
+
+    async def refresh(self) -> UserAccess:
+        """Refreshes the admin access data."""
+
+        try:
+            log.info("\nAccessTokenProvider: refreshing the admin token.\n")
+            access_data = await self._refresh_func()
+            self._access_data = access_data
+            self._expires_at = get_token_expire_time(
+                access_data.users_access_token
+            )
+            return access_data
+        finally:
+            self._refresh_task = None
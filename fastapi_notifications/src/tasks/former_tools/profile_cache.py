@@ -0,0 +1,64 @@
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from uuid import UUID
+
+from core.config import config
+from schemas.user import UserAuth
+
+
+class ProfileCache:
+    """An in-process TTL and LRU cache of the user profiles."""
+
+    def __init__(self, max_size: int = 10_000, ttl: float = 300) -> None:
+        self._max_size = max_size
+        self._ttl = ttl
+        self._profiles: OrderedDict[UUID, tuple[float, UserAuth]] = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: UUID) -> UserAuth | None:
+        """Gets the profile if it is cached and not expired."""
+
+        item = self._profiles.get(user_id)
+        if item is None:
+            self.misses += 1
+            return None
+
+        expires_at, profile = item
+        if expires_at < time.monotonic():
+            del self._profiles[user_id]
+            self.misses += 1
+            return None
+
+        self._profiles.move_to_end(user_id)
+        self.hits += 1
+        return profile
+
+    def set(self, user_id: UUID, profile: UserAuth) -> None:
+        """Puts the profile in cache evicting the least recently used."""
+
+        self._profiles[user_id] = (time.monotonic() + self._ttl, profile)
+        self._profiles.move_to_end(user_id)
+        while len(self._profiles) > self._max_size:
+            self._profiles.popitem(last=False)
+
+    def stats(self) -> dict[str, int]:
+        """Returns the cache counters."""
+
+        return {
+            "size": len(self._profiles),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+@lru_cache()
+def get_profile_cache() -> ProfileCache:
+    """ProfileCache provider (one cache per process)."""
+    return ProfileCache(
+        max_size=config.globals.profiles_cache_size,
+        ttl=config.globals.profiles_cache_ttl,
+    )
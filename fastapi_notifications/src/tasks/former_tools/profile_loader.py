@@ -0,0 +1,83 @@
+import asyncio
+from typing import Awaitable, Callable
+from uuid import UUID
+
+from core.logger import log
+from schemas.user import UserAuth
+
+
+class ProfileLoader:
+    """A class for batching the user profiles requests.
+
+    Concurrent `load` calls are collected for a short window and
+    resolved with one request for all the distinct user ids.
+    """
+
+    def __init__(
+        self,
+        fetch_func: Callable[[list[UUID]], Awaitable[dict[UUID, UserAuth]]],
+        max_batch_size: int = 100,
+        batch_window: float = 0.05,
+    ) -> None:
+        self._fetch_func = fetch_func
+        self._max_batch_size = max_batch_size
+        self._batch_window = batch_window
+        self._pending: dict[UUID, list[asyncio.Future]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, user_id: UUID) -> UserAuth | None:
+        """Gets the user profile (None if the user not found)."""
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(user_id, []).append(future)
+
+        if len(self._pending) >= self._max_batch_size:
+            self.dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._batch_window, self.dispatch)
+
+        return await future
+
+    def dispatch(self) -> None:
+        """Sends the collected user ids in one request."""
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        pending, self._pending = self._pending, {}
+        if pending:
+            task = asyncio.create_task(self.resolve(pending))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def resolve(self, pending: dict[UUID, list[asyncio.Future]]) -> None:
+        """Resolves the waiting callers with the fetched profiles."""
+
+        log.info(f"\nProfileLoader: fetching {len(pending)} profiles.\n")
+        try:
+            profiles = await self._fetch_func(list(pending))
+        except Exception as err:
+            log.error(f"ProfileLoader: An error while fetching: {err}")
+            self.set_results(pending, exception=err)
+        else:
+            self.set_results(pending, profiles=profiles)
+
+    @staticmethod
+    def set_results(
+        pending: dict[UUID, list[asyncio.Future]],
+        profiles: dict[UUID, UserAuth] | None = None,
+        exception: Exception | None = None,
+    ) -> None:
+        """Sets the results of the futures."""
+
+        for user_id, futures in pending.items():
+            for future in futures:
+                if future.done():
+                    continue
+                if exception is not None:
+                    future.set_exception(exception)
+                else:
+                    future.set_result(profiles.get(user_id))
@@ -0,0 +1,58 @@
+import asyncio
+
+from celery import shared_task
+
+from core.config import config
+from core.logger import log
+from services.notifications import NotificationsService
+from services.partitions import PartitionsService
+
+
+async def maintain_partitions(
+    partitions_service: PartitionsService,
+    notifications_service: NotificationsService,
+) -> None:
+    """Creates the future partitions and detaches the expired ones."""
+
+    created = await partitions_service.create_partitions(
+        months_ahead=config.globals.partitions_premake
+    )
+    detached = []
+    if config.globals.partitions_retention:
+        detached = await partitions_service.drop_partitions(
+            retention_months=config.globals.partitions_retention,
+            drop_detached=config.globals.partitions_drop_detached,
+        )
+    deleted = await notifications_service.delete_expired_idempotency_keys(
+        ttl=config.globals.idempotency_ttl
+    )
+    log.info(
+        f"\nPartitions: {len(created)} created, {len(detached)} detached, "
+        f"{deleted} idempotency keys deleted.\n"
+    )
+
+
+async def partitions_main() -> None:
+    """The partitions maintenance main function."""
+
+    notifications_service = NotificationsService()
+    try:
+        await maintain_partitions(PartitionsService(), notifications_service)
+    finally:
+        await notifications_service.broker_service.close_connection_pool()
+
+
+@shared_task(bind=True)
+def partitions_task(self, name: str) -> None:
+    """A celery worker partitions maintenance task."""
+
+    log.info(f"\n{'-'*30}\n{name} launched.\n")
+
+    asyncio.run(partitions_main())
+
+    log.info(f"\n\n{'-'*30}\n")
+
+
+if __name__ == "__main__":
+    # A one-off maintenance (e.g. before a large import)
+    asyncio.run(partitions_main())
@@ -0,0 +1,59 @@
+import asyncio
+
+from celery import shared_task
+
+from core.config import config
+from core.logger import log
+from services.notifications import NotificationsService
+
+
+async def relay_messages(notifications_service: NotificationsService) -> int:
+    """Publishes the outbox messages to the broker."""
+
+    relayed = await notifications_service.relay_outbox_messages(
+        batch_size=config.globals.relay_batch_size
+    )
+    if relayed:
+        log.info(f"\nRelay: {relayed} messages published.\n")
+    return relayed
+
+
+async def run_relay() -> None:
+    """Drains the outbox for the life of the process."""
+
+    notifications_service = NotificationsService()
+    try:
+        while True:
+            try:
+                await relay_messages(notifications_service)
+            except Exception as err:
+                log.error(f"Relay: An error while publishing: {err}")
+            await asyncio.sleep(config.globals.relay_interval)
+    finally:
+        await notifications_service.broker_service.close_connection_pool()
+
+
+async def relay_main() -> None:
+    """The relay main function."""
+
+    notifications_service = NotificationsService()
+    try:
+        await relay_messages(notifications_service)
+    finally:
+        await notifications_service.broker_service.close_connection_pool()
+
+
+@shared_task(bind=True)
+def relay_task(self, name: str) -> None:
+    """A celery worker relay task."""
+
+    log.info(f"\n{'-'*30}\n{name} launched.\n")
+
+    asyncio.run(relay_main())
+
+    log.info(f"\n\n{'-'*30}\n")
+
+
+if __name__ == "__main__":
+    # The persistent relay (RABBITMQ_PERSISTENT_CONSUMERS=True)
+    asyncio.run(run_relay())
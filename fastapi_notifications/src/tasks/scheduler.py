@@ -0,0 +1,61 @@
+import asyncio
+
+from celery import shared_task
+
+from core.config import config
+from core.logger import log
+from services.notifications import NotificationsService
+
+
+async def release_notifications(
+    notifications_service: NotificationsService,
+) -> int:
+    """Releases the due scheduled notifications."""
+
+    released = await notifications_service.release_due_notifications(
+        batch_size=config.globals.scheduler_batch_size
+    )
+    if released:
+        log.info(f"\nScheduler: {released} notifications released.\n")
+    return released
+
+
+async def run_scheduler() -> None:
+    """Releases the due notifications for the life of the process."""
+
+    notifications_service = NotificationsService()
+    try:
+        while True:
+            try:
+                await release_notifications(notifications_service)
+            except Exception as err:
+                log.error(f"Scheduler: An error while releasing: {err}")
+            await asyncio.sleep(config.globals.scheduler_interval)
+    finally:
+        await notifications_service.broker_service.close_connection_pool()
+
+
+async def scheduler_main() -> None:
+    """The scheduler main function."""
+
+    notifications_service = NotificationsService()
+    try:
+        await release_notifications(notifications_service)
+    finally:
+        await notifications_service.broker_service.close_connection_pool()
+
+
+@shared_task(bind=True)
+def scheduler_task(self, name: str) -> None:
+    """A celery worker scheduler task."""
+
+    log.info(f"\n{'-'*30}\n{name} launched.\n")
+
+    asyncio.run(scheduler_main())
+
+    log.info(f"\n\n{'-'*30}\n")
+
+
+if __name__ == "__main__":
+    # The persistent scheduler (RABBITMQ_PERSISTENT_CONSUMERS=True)
+    asyncio.run(run_scheduler())
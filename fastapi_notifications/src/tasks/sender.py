@@ -1,34 +1,43 @@
 import asyncio
 import json
-import os
-from datetime import datetime, timezone
+import sys
+from contextlib import AsyncExitStack
+from datetime import datetime
 
 from celery import shared_task
 
 from core.config import config
-from core.constants import EXCHANGES, QUEUES
+from core.constants import CHANNELS, EXCHANGES, QUEUES, STAGES
 from core.logger import log
-from schemas.notifications import NotificationTask, NotificationUpdateTimeDto
+from core.routing import (
+    get_binding_key,
+    get_channel_queue,
+    get_routing_key,
+)
+from schemas.notifications import NotificationTask
 from services.broker import BrokerService
 from services.notifications import NotificationsService
-from tasks.sender_tools.email.emailer import EmailService
+from tasks.sender_tools.channels.dispatcher import ChannelDispatcher
+from tasks.sender_tools.channels.senders import (
+    EmailSender,
+    StubSender,
+    WebhookSender,
+)
+from tasks.sender_tools.deduplicator import Deduplicator
+from tasks.sender_tools.delivery_log import DeliveryLog
+from tasks.sender_tools.sent_buffer import SentTimeBuffer
 
 
-def output_func(output_name: str, timestamp: datetime, message: dict) -> None:
-    """Output data function for debug."""
-
-    file_path = f"./_temp/outputs/output_{output_name}.log"
-
-    directory = os.path.dirname(file_path)
-    if not os.path.exists(directory):
-        os.makedirs(directory)
-
-    with open(file_path, mode="a", encoding="utf-8") as fwa:
-        fwa.writelines(f"{timestamp}: {message}\n")
-
+async def process_message(
+    message: str,
+    dispatcher: ChannelDispatcher,
+    sent_buffer: SentTimeBuffer,
+    deduplicator: Deduplicator,
+) -> None:
+    """Processes a message from the broker.
 
-async def process_message(message: str, emailer: EmailService | None) -> None:
-    """Processes a message from the broker."""
+    A redelivered notification which is already sent is skipped.
+    """
 
     log.info(
         f"\n{__name__}: {process_message.__name__}: "
@@ -36,51 +45,231 @@ async def process_message(message: str, emailer: EmailService | None) -> None:
     )
 
     notification_task = NotificationTask(**json.loads(message))
-    notification_id = notification_task.id
+    if not await deduplicator.claim(notification_task.id):
+        log.info(
+            f"\nThe notification {notification_task.id} is already sent."
+        )
+        return
 
-    timestamp = datetime.now(timezone.utc).isoformat()
+    try:
+        await dispatcher.dispatch(notification_task)
+    except Exception:
+        await deduplicator.release(notification_task.id)
+        raise
 
-    if notification_task.notification_type == "email":
-        if config.smtp.is_active:
-            await emailer.send_email(
-                notification_task.user_email,
-                notification_task.subject,
-                notification_task.message,
-            )
-        output_func("email", timestamp, notification_task.model_dump())
-    else:
-        output_func("other", timestamp, notification_task.model_dump())
+    await deduplicator.confirm(notification_task.id)
+    # The naive UTC time of the database
+    await sent_buffer.add(notification_task.id, datetime.utcnow())
+
+
+def get_delivery_log() -> DeliveryLog:
+    """DeliveryLog provider."""
+
+    return DeliveryLog(
+        directory=config.delivery_log.directory,
+        buffer_size=config.delivery_log.buffer_size,
+        flush_interval=config.delivery_log.flush_interval,
+        max_bytes=config.delivery_log.max_bytes,
+        backup_count=config.delivery_log.backup_count,
+    )
+
+
+def get_channel_dispatcher(delivery_log: DeliveryLog) -> ChannelDispatcher:
+    """ChannelDispatcher provider (a sender per notification type)."""
+
+    channels = config.channels
+    dispatcher = ChannelDispatcher(
+        StubSender(
+            CHANNELS.OTHER,
+            delivery_log,
+            concurrency=channels.other_concurrency,
+            batch_size=channels.other_batch_size,
+            rate_limit=channels.other_rate_limit,
+        )
+    )
+    dispatcher.register(
+        CHANNELS.EMAIL,
+        EmailSender(
+            delivery_log,
+            concurrency=channels.email_concurrency,
+            batch_size=channels.email_batch_size,
+            rate_limit=channels.email_rate_limit,
+        ),
+    )
+    dispatcher.register(
+        CHANNELS.WEBHOOK,
+        WebhookSender(
+            channels.webhook_url,
+            delivery_log,
+            concurrency=channels.webhook_concurrency,
+            batch_size=channels.webhook_batch_size,
+            rate_limit=channels.webhook_rate_limit,
+        ),
+    )
+    for name in (CHANNELS.PUSH, CHANNELS.SMS):
+        dispatcher.register(
+            name,
+            StubSender(
+                name,
+                delivery_log,
+                concurrency=getattr(channels, f"{name}_concurrency"),
+                batch_size=getattr(channels, f"{name}_batch_size"),
+                rate_limit=getattr(channels, f"{name}_rate_limit"),
+            ),
+        )
+    return dispatcher
+
+
+def get_deduplicator() -> Deduplicator:
+    """Deduplicator provider."""
+
+    return Deduplicator(
+        ttl=config.globals.dedup_ttl,
+        claim_ttl=config.globals.dedup_claim_ttl,
+    )
 
-    notification_update = NotificationUpdateTimeDto(last_sent_at=timestamp)
+
+def get_sent_time_buffer() -> SentTimeBuffer:
+    """SentTimeBuffer provider."""
 
     notifications_service = NotificationsService()
-    await notifications_service.update_notification(
-        notification_id, notification_update
+    return SentTimeBuffer(
+        notifications_service.update_notifications_sent_time,
+        batch_size=config.globals.sent_time_batch_size,
+        flush_interval=config.globals.sent_time_flush_interval,
+        max_retries=config.globals.sent_time_max_retries,
+    )
+
+
+def get_formed_routing_key(message_body: bytes) -> str:
+    """Gets the routing key of the formed notification message."""
+
+    notification_task = NotificationTask.model_validate_json(message_body)
+    return get_routing_key(
+        STAGES.FORMED_TASKS,
+        notification_task.notification_type,
+        notification_task.priority,
     )
 
 
+def get_formed_queues(queue_name: str) -> dict[str, str]:
+    """Gets the binding keys of the channels queues by their names."""
+
+    return {
+        get_channel_queue(queue_name, channel): get_binding_key(
+            STAGES.FORMED_TASKS, channel
+        )
+        for channel in CHANNELS.model_dump().values()
+    }
+
+
 async def queue_get_messages(
+    channels: list[str] | None = None,
     exchange_name: str = EXCHANGES.FORMED_TASKS,
     queue_name: str = QUEUES.FORMED_TASKS,
 ) -> None:
-    """Gets messages from the broker."""
+    """Gets messages from the queues of the channels (all by default)."""
 
+    channels = channels or list(CHANNELS.model_dump().values())
     log.info(
         f"\n{__name__}: {queue_get_messages.__name__}: "
-        f"Checking for new messages..."
+        f"Checking for new messages of channels {channels}..."
     )
 
     broker_service = BrokerService()
-    if config.smtp.is_active:
-        email_service = EmailService()
-        async with email_service as emailer:
-            await broker_service.get_messages(
-                exchange_name, queue_name, process_message, emailer=emailer
-            )
-    else:
-        await broker_service.get_messages(
-            exchange_name, queue_name, process_message, emailer=None
+    # The single formed queue is replaced by the channels queues
+    await broker_service.retire_queue(
+        exchange_name,
+        queue_name,
+        get_formed_routing_key,
+        target_queues=get_formed_queues(queue_name),
+    )
+    async with AsyncExitStack() as stack:
+        sent_buffer = await stack.enter_async_context(get_sent_time_buffer())
+        deduplicator = await stack.enter_async_context(get_deduplicator())
+        delivery_log = await stack.enter_async_context(get_delivery_log())
+        dispatcher = await stack.enter_async_context(
+            get_channel_dispatcher(delivery_log)
+        )
+
+        await asyncio.gather(
+            *[
+                broker_service.get_messages(
+                    exchange_name,
+                    get_channel_queue(queue_name, channel),
+                    process_message,
+                    concurrency=config.globals.sender_concurrency,
+                    binding_key=get_binding_key(
+                        STAGES.FORMED_TASKS, channel
+                    ),
+                    dispatcher=dispatcher,
+                    sent_buffer=sent_buffer,
+                    deduplicator=deduplicator,
+                )
+                for channel in channels
+            ]
+        )
+
+
+async def queue_listen_messages(
+    channels: list[str] | None = None,
+    exchange_name: str = EXCHANGES.FORMED_TASKS,
+    queue_name: str = QUEUES.FORMED_TASKS,
+) -> None:
+    """Listens to the queues of the channels for the life of the process.
+
+    Every channel has its own queue, so the senders of the channels
+    can be scaled independently (all channels by default).
+    """
+
+    channels = channels or list(CHANNELS.model_dump().values())
+    log.info(
+        f"\n{__name__}: {queue_listen_messages.__name__}: "
+        f"Waiting for new messages of channels {channels}..."
+    )
+
+    broker_service = BrokerService()
+    try:
+        # The single formed queue is replaced by the channels queues
+        await broker_service.retire_queue(
+            exchange_name,
+            queue_name,
+            get_formed_routing_key,
+            target_queues=get_formed_queues(queue_name),
         )
+        async with AsyncExitStack() as stack:
+            sent_buffer = await stack.enter_async_context(
+                get_sent_time_buffer()
+            )
+            deduplicator = await stack.enter_async_context(
+                get_deduplicator()
+            )
+            delivery_log = await stack.enter_async_context(
+                get_delivery_log()
+            )
+            dispatcher = await stack.enter_async_context(
+                get_channel_dispatcher(delivery_log)
+            )
+
+            await asyncio.gather(
+                *[
+                    broker_service.listen_messages(
+                        exchange_name,
+                        get_channel_queue(queue_name, channel),
+                        process_message,
+                        concurrency=config.globals.sender_concurrency,
+                        binding_key=get_binding_key(
+                            STAGES.FORMED_TASKS, channel
+                        ),
+                        dispatcher=dispatcher,
+                        sent_buffer=sent_buffer,
+                        deduplicator=deduplicator,
+                    )
+                    for channel in channels
+                ]
+            )
+    finally:
+        await broker_service.close_connection_pool()
 
 
 async def sender_main() -> None:
@@ -99,3 +288,9 @@ def sender_task(self, name: str) -> None:
     asyncio.run(sender_main())
 
     log.info(f"\n\n{'-'*30}\n")
+
+
+if __name__ == "__main__":
+    # The persistent sender (RABBITMQ_PERSISTENT_CONSUMERS=True)
+    # Channels to serve: `python -m tasks.sender email sms`
+    asyncio.run(queue_listen_messages(sys.argv[1:]))
@@ -0,0 +1,145 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from typing import Any
+
+from core.logger import log
+from schemas.notifications import NotificationTask
+
+
+class RateLimiter:
+    """A token bucket rate limiter (`rate` messages per second)."""
+
+    def __init__(self, rate: float = 0) -> None:
+        self._rate = rate
+        self._tokens = rate
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int = 1) -> None:
+        """Waits until the tokens are available (no limit if rate is 0)."""
+
+        if self._rate <= 0:
+            return
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    max(self._rate, tokens),
+                    self._tokens + (now - self._updated_at) * self._rate,
+                )
+                self._updated_at = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self._rate)
+
+
+class ChannelSender(ABC):
+    """An abstract class for the notifications channel senders.
+
+    Every sender has its own concurrency limit, batch size and rate limit,
+    so a slow channel does not hold up the others.
+    """
+
+    name: str = "other"
+
+    def __init__(
+        self,
+        concurrency: int = 10,
+        batch_size: int = 1,
+        rate_limit: float = 0,
+        batch_window: float = 0.05,
+    ) -> None:
+        self._batch_size = batch_size
+        self._batch_window = batch_window
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._rate_limiter = RateLimiter(rate_limit)
+        self._pending: list[tuple[NotificationTask, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def __aenter__(self) -> "ChannelSender":
+        return self
+
+    async def __aexit__(
+        self, exc_type: Any, exc_val: Any, exc_tb: Any
+    ) -> None:
+        self.dispatch()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    @abstractmethod
+    async def send_many(
+        self, notifications_tasks: list[NotificationTask]
+    ) -> list[BaseException | None] | None:
+        """Sends the notifications.
+
+        Returns the error of each notification (None if it is sent)
+        or None if all of them are sent. Raising fails the whole batch.
+        """
+
+    async def send(self, notification_task: NotificationTask) -> None:
+        """Sends the notification (batched if `batch_size` > 1)."""
+
+        if self._batch_size <= 1:
+            errors = await self.send_batch([notification_task])
+            if errors and errors[0] is not None:
+                raise errors[0]
+            return
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((notification_task, future))
+        if len(self._pending) >= self._batch_size:
+            self.dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._batch_window, self.dispatch)
+        await future
+
+    def dispatch(self) -> None:
+        """Sends the collected notifications as one batch."""
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        pending, self._pending = self._pending, []
+        if pending:
+            task = asyncio.create_task(self.resolve(pending))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def resolve(
+        self, pending: list[tuple[NotificationTask, asyncio.Future]]
+    ) -> None:
+        """Sends the batch and resolves each caller by its result."""
+
+        try:
+            errors = await self.send_batch(
+                [notification_task for notification_task, _ in pending]
+            )
+        except Exception as err:
+            errors = [err] * len(pending)
+        errors = errors or [None] * len(pending)
+
+        for (_, future), error in zip(pending, errors):
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+
+    async def send_batch(
+        self, notifications_tasks: list[NotificationTask]
+    ) -> list[BaseException | None] | None:
+        """Sends the batch within the concurrency and rate limits."""
+
+        async with self._semaphore:
+            await self._rate_limiter.acquire(len(notifications_tasks))
+            log.debug(
+                f"\nChannel {self.name}: "
+                f"sending {len(notifications_tasks)} notifications."
+            )
+            return await self.send_many(notifications_tasks)
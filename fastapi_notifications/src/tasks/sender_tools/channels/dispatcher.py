@@ -0,0 +1,43 @@
+from contextlib import AsyncExitStack
+from typing import Any
+
+from core.logger import log
+from schemas.notifications import NotificationTask
+from tasks.sender_tools.channels.base import ChannelSender
+
+
+class ChannelDispatcher:
+    """A class for routing the notifications to the channel senders."""
+
+    def __init__(self, default_sender: ChannelSender) -> None:
+        self._default_sender = default_sender
+        self._senders: dict[str, ChannelSender] = {}
+        self._stack: AsyncExitStack | None = None
+
+    def register(self, notification_type: str, sender: ChannelSender) -> None:
+        """Registers the sender of the notification type."""
+
+        self._senders[notification_type] = sender
+
+    async def __aenter__(self) -> "ChannelDispatcher":
+        self._stack = AsyncExitStack()
+        for sender in {*self._senders.values(), self._default_sender}:
+            await self._stack.enter_async_context(sender)
+        return self
+
+    async def __aexit__(
+        self, exc_type: Any, exc_val: Any, exc_tb: Any
+    ) -> None:
+        if self._stack:
+            await self._stack.aclose()
+
+    async def dispatch(self, notification_task: NotificationTask) -> None:
+        """Sends the notification through the sender of its type."""
+
+        sender = self._senders.get(
+            notification_task.notification_type, self._default_sender
+        )
+        log.debug(
+            f"\nDispatcher: {notification_task.id} -> channel {sender.name}"
+        )
+        await sender.send(notification_task)
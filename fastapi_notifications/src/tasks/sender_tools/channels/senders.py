@@ -0,0 +1,149 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Any
+
+import httpx
+
+from core.config import config
+from core.logger import log
+from schemas.notifications import NotificationTask
+from services.http_client import create_http_client
+from tasks.sender_tools.channels.base import ChannelSender
+from tasks.sender_tools.delivery_log import DeliveryLog
+from tasks.sender_tools.email.emailer import EmailService
+
+
+class StubSender(ChannelSender):
+    """A local sender writing the notifications to the delivery log."""
+
+    def __init__(self, name: str, delivery_log: DeliveryLog, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.name = name
+        self._delivery_log = delivery_log
+
+    async def send_many(
+        self, notifications_tasks: list[NotificationTask]
+    ) -> list[BaseException | None] | None:
+        timestamp = datetime.now(timezone.utc).isoformat()
+        for notification_task in notifications_tasks:
+            self._delivery_log.write(
+                self.name, timestamp, notification_task.model_dump()
+            )
+        return None
+
+
+class EmailSender(StubSender):
+    """A sender of the email notifications (SMTP connections pool).
+
+    The SMTP connections are opened on the first email, so the
+    processes of the other channels don't connect.
+    """
+
+    def __init__(self, delivery_log: DeliveryLog, **kwargs) -> None:
+        super().__init__("email", delivery_log, **kwargs)
+        self._email_service: EmailService | None = None
+        self._email_service_lock = asyncio.Lock()
+
+    async def get_email_service(self) -> EmailService | None:
+        """Gets the email service opening it on the first call."""
+
+        if self._email_service or not config.smtp.is_active:
+            return self._email_service
+
+        async with self._email_service_lock:
+            if self._email_service is None:
+                email_service = EmailService()
+                await email_service.__aenter__()
+                self._email_service = email_service
+        return self._email_service
+
+    async def __aexit__(
+        self, exc_type: Any, exc_val: Any, exc_tb: Any
+    ) -> None:
+        await super().__aexit__(exc_type, exc_val, exc_tb)
+        if self._email_service:
+            await self._email_service.__aexit__(exc_type, exc_val, exc_tb)
+
+    async def send_many(
+        self, notifications_tasks: list[NotificationTask]
+    ) -> list[BaseException | None] | None:
+        email_service = await self.get_email_service()
+        if email_service is None:
+            return await super().send_many(notifications_tasks)
+
+        # A failed letter fails only its notification
+        results = await asyncio.gather(
+            *[
+                email_service.send_email(
+                    notification_task.user_email,
+                    notification_task.subject,
+                    notification_task.message,
+                    notification_task.template_id,
+                )
+                for notification_task in notifications_tasks
+            ],
+            return_exceptions=True,
+        )
+        errors = [
+            result if isinstance(result, BaseException) else None
+            for result in results
+        ]
+        await super().send_many(
+            [
+                notification_task
+                for notification_task, error in zip(
+                    notifications_tasks, errors
+                )
+                if error is None
+            ]
+        )
+        return errors
+
+
+class WebhookSender(StubSender):
+    """A sender posting the notifications batches to the webhook url.
+
+    The delivery log stub is used if the url is not configured.
+    The http client lives in the event loop of the sender context.
+    """
+
+    def __init__(
+        self, url: str | None, delivery_log: DeliveryLog, **kwargs
+    ) -> None:
+        super().__init__("webhook", delivery_log, **kwargs)
+        self._url = url
+        self._client: httpx.AsyncClient | None = None
+
+    async def __aenter__(self) -> "WebhookSender":
+        if self._url:
+            self._client = create_http_client()
+        return self
+
+    async def __aexit__(
+        self, exc_type: Any, exc_val: Any, exc_tb: Any
+    ) -> None:
+        await super().__aexit__(exc_type, exc_val, exc_tb)
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    async def send_many(
+        self, notifications_tasks: list[NotificationTask]
+    ) -> list[BaseException | None] | None:
+        if not self._client:
+            return await super().send_many(notifications_tasks)
+
+        response = await self._client.post(
+            url=self._url,
+            json=[
+                notification_task.model_dump(mode="json")
+                for notification_task in notifications_tasks
+            ],
+        )
+        if response.is_error:
+            log.error(
+                f"Webhook: An error while sending: "
+                f"status: {response.status_code}, response: {response.text}"
+            )
+            response.raise_for_status()
+        return None
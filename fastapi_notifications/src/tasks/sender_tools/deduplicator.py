@@ -0,0 +1,95 @@
+from typing import Any
+from uuid import UUID
+
+from redis.asyncio import Redis
+
+from core.config import config
+from core.logger import log
+from services.cache import CacheService
+
+SENDING = "sending"
+SENT = "sent"
+
+
+class NotificationInFlightError(Exception):
+    """The notification is being sent by another consumer."""
+
+
+class Deduplicator:
+    """A class for skipping the redelivered notifications.
+
+    A notification is claimed in redis (SET NX) for `claim_ttl` seconds
+    before sending and marked sent for `ttl` seconds after that, so
+    a broker redelivery of a sent notification is acknowledged without
+    sending it again. The claim of a crashed sender expires.
+    """
+
+    def __init__(self, ttl: int = 60 * 60 * 24, claim_ttl: int = 60) -> None:
+        self._ttl = ttl
+        self._claim_ttl = claim_ttl
+        self._cache_service = CacheService()
+        self._client: Redis | None = None
+
+    async def __aenter__(self) -> "Deduplicator":
+        self._client = Redis(host=config.cache.host, port=config.cache.port)
+        return self
+
+    async def __aexit__(
+        self, exc_type: Any, exc_val: Any, exc_tb: Any
+    ) -> None:
+        if self._client:
+            await self._client.aclose()
+
+    @staticmethod
+    def get_key(notification_id: UUID) -> str:
+        """Gets the cache key of the notification."""
+
+        return f"sent:{notification_id}"
+
+    async def claim(self, notification_id: UUID) -> bool:
+        """Claims the notification, False if it is already sent.
+
+        Raises NotificationInFlightError if the notification is being
+        sent, so the message is retried after the claim is resolved.
+        """
+
+        key = self.get_key(notification_id)
+        try:
+            if await self._cache_service.add(
+                self._client, key, SENDING, self._claim_ttl
+            ):
+                return True
+            state = await self._cache_service.get(self._client, key)
+        except Exception as err:
+            # Sending twice is better than not sending
+            log.error(f"Deduplicator: An error while claiming: {err}")
+            return True
+
+        if state is None:
+            # The claim has just expired
+            return await self.claim(notification_id)
+        if state.decode() == SENT:
+            return False
+        raise NotificationInFlightError(
+            f"The notification {notification_id} is being sent."
+        )
+
+    async def confirm(self, notification_id: UUID) -> None:
+        """Marks the claimed notification sent for the ttl."""
+
+        try:
+            await self._cache_service.set(
+                self._client, self.get_key(notification_id), SENT, self._ttl
+            )
+        except Exception as err:
+            log.error(f"Deduplicator: An error while confirming: {err}")
+
+    async def release(self, notification_id: UUID) -> None:
+        """Releases the claim of the notification (not sent)."""
+
+        try:
+            await self._cache_service.delete(
+                self._client, self.get_key(notification_id)
+            )
+        except Exception as err:
+            log.error(f"Deduplicator: An error while releasing: {err}")
@@ -0,0 +1,107 @@
+import asyncio
+import os
+from typing import Any
+
+from core.logger import log
+
+
+class DeliveryLog:
+    """A class for buffered writing of the delivery log (debug output).
+
+    The lines are collected in memory and written by a background task
+    in a thread, when `buffer_size` lines are collected or every
+    `flush_interval` seconds. The files are rotated by size.
+    """
+
+    def __init__(
+        self,
+        directory: str = "./_temp/outputs",
+        buffer_size: int = 1_000,
+        flush_interval: float = 1.0,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+    ) -> None:
+        self._directory = directory
+        self._buffer_size = buffer_size
+        self._flush_interval = flush_interval
+        self._max_bytes = max_bytes
+        self._backup_count = backup_count
+        self._buffers: dict[str, list[str]] = {}
+        self._lines_count = 0
+        self._flush_lock = asyncio.Lock()
+        self._flusher: asyncio.Task | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def __aenter__(self) -> "DeliveryLog":
+        self._flusher = asyncio.create_task(self.flush_periodically())
+        return self
+
+    async def __aexit__(
+        self, exc_type: Any, exc_val: Any, exc_tb: Any
+    ) -> None:
+        if self._flusher:
+            self._flusher.cancel()
+        await asyncio.gather(*self._tasks)
+        await self.flush()
+
+    def write(self, output_name: str, timestamp: str, message: dict) -> None:
+        """Adds a line to the output buffer (does not block)."""
+
+        lines = self._buffers.setdefault(output_name, [])
+        lines.append(f"{timestamp}: {message}\n")
+        self._lines_count += 1
+
+        if self._lines_count >= self._buffer_size:
+            self._lines_count = 0
+            task = asyncio.create_task(self.flush())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def flush(self) -> None:
+        """Writes the buffered lines to the files in a thread."""
+
+        async with self._flush_lock:
+            buffers, self._buffers = self._buffers, {}
+            self._lines_count = 0
+            if not buffers:
+                return
+            try:
+                await asyncio.to_thread(self.write_files, buffers)
+            except OSError as err:
+                log.error(f"DeliveryLog: An error while writing: {err}")
+
+    async def flush_periodically(self) -> None:
+        """Flushes the buffers every `flush_interval` seconds."""
+
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            await self.flush()
+
+    def write_files(self, buffers: dict[str, list[str]]) -> None:
+        """Appends the lines to the output files."""
+
+        os.makedirs(self._directory, exist_ok=True)
+        for output_name, lines in buffers.items():
+            file_path = os.path.join(
+                self._directory, f"output_{output_name}.log"
+            )
+            self.rotate(file_path)
+            with open(file_path, mode="a", encoding="utf-8") as fwa:
+                fwa.writelines(lines)
+
+    def rotate(self, file_path: str) -> None:
+        """Rotates the file if it exceeds `max_bytes`."""
+
+        if not self._max_bytes or not os.path.exists(file_path):
+            return
+        if os.path.getsize(file_path) < self._max_bytes:
+            return
+
+        if self._backup_count <= 0:
+            os.remove(file_path)
+            return
+        for i in range(self._backup_count - 1, 0, -1):
+            source = f"{file_path}.{i}"
+            if os.path.exists(source):
+                os.replace(source, f"{file_path}.{i + 1}")
+        os.replace(file_path, f"{file_path}.1")
@@ -1,13 +1,15 @@
-import os
+import asyncio
 from email.message import EmailMessage
 from typing import Any
 from uuid import UUID
 
 import aiosmtplib
-from jinja2 import Environment, FileSystemLoader
+from jinja2.exceptions import SecurityError
 
 from core.config import config
 from core.logger import log
+from services.broker import RejectedMessageError
+from tasks.sender_tools.email.templates import get_template_registry
 
 LOGIN = config.smtp.login
 PASSWORD = config.smtp.password
@@ -17,57 +19,148 @@ SMTP_HOST = config.smtp.host
 SMTP_PORT = config.smtp.port
 
 
-class EmailService:
-    """A class for work with emails."""
+def is_recipient_refused(err: aiosmtplib.errors.SMTPException) -> bool:
+    """Checks if the recipient is refused permanently (a 5xx reply)."""
+
+    if isinstance(err, aiosmtplib.errors.SMTPRecipientsRefused):
+        return all(recipient.code >= 500 for recipient in err.recipients)
+    if isinstance(err, aiosmtplib.errors.SMTPRecipientRefused):
+        return err.code >= 500
+    return False
+
+
+class SMTPConnection:
+    """A class for work with an authenticated SMTP connection."""
 
     def __init__(self) -> None:
-        self._server = None
+        self._server: aiosmtplib.SMTP | None = None
+        self.sent_messages = 0
+
+    @property
+    def is_connected(self) -> bool:
+        return self._server is not None and self._server.is_connected
+
+    async def connect(self) -> None:
+        """Connects and logs in to the SMTP server."""
 
-    async def __aenter__(self) -> "EmailService":
         self._server = aiosmtplib.SMTP(
             hostname=SMTP_HOST, port=SMTP_PORT, use_tls=True
         )
         await self._server.connect()
         await self._server.login(LOGIN, PASSWORD)
+        self.sent_messages = 0
         log.info("\nEmail login done.")
+
+    async def close(self) -> None:
+        """Closes the connection."""
+
+        if self.is_connected:
+            try:
+                await self._server.quit()
+            except aiosmtplib.errors.SMTPException as err:
+                log.warning(f"An error while closing the connection: {err}")
+        self._server = None
+
+    async def send_message(self, message: EmailMessage) -> None:
+        """Sends a message reconnecting once if the server dropped."""
+
+        if not self.is_connected:
+            await self.connect()
+        try:
+            await self._server.send_message(message)
+        except aiosmtplib.errors.SMTPServerDisconnected:
+            log.warning("\nThe SMTP server disconnected, reconnecting.")
+            await self.connect()
+            await self._server.send_message(message)
+        self.sent_messages += 1
+
+
+class EmailService:
+    """A class for work with emails.
+
+    The letters are sent concurrently through a pool of SMTP connections.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = config.smtp.pool_size,
+        max_messages_per_connection: int = (
+            config.smtp.max_messages_per_connection
+        ),
+    ) -> None:
+        self._pool_size = pool_size
+        self._max_messages_per_connection = max_messages_per_connection
+        self._connections: list[SMTPConnection] = []
+        self._pool: asyncio.Queue | None = None
+
+    async def __aenter__(self) -> "EmailService":
+        self._connections = [SMTPConnection() for _ in range(self._pool_size)]
+        self._pool = asyncio.Queue()
+        for connection in self._connections:
+            self._pool.put_nowait(connection)
+
+        # Fail fast on the wrong credentials, the rest connect lazily
+        await self._connections[0].connect()
         return self
 
     async def __aexit__(
         self, exc_type: Any, exc_val: Any, exc_tb: Any
     ) -> None:
-        if self._server:
-            await self._server.quit()
+        for connection in self._connections:
+            await connection.close()
+
+    async def send_message(self, message: EmailMessage) -> None:
+        """Sends a message through a free pooled connection."""
+
+        connection = await self._pool.get()
+        try:
+            await connection.send_message(message)
+        except aiosmtplib.errors.SMTPServerDisconnected:
+            await connection.close()
+            raise
+        finally:
+            if connection.sent_messages >= self._max_messages_per_connection:
+                # Recycle the connection
+                await connection.close()
+            self._pool.put_nowait(connection)
 
     async def send_email(
         self, email: str, subject: str, text: str, template_id: UUID = None
     ) -> None:
-        """Sends a message."""
+        """Sends a message.
+
+        A refused recipient or an unsafe template raises
+        RejectedMessageError (no retries), the other SMTP errors
+        are raised to retry the message.
+        """
 
         message = EmailMessage()
         message["From"] = EMAIL
         message["To"] = email
         message["Subject"] = subject
 
-        if template_id is None:
-            current_path = os.path.dirname(__file__)
-            loader = FileSystemLoader(current_path)
-            env = Environment(loader=loader)
-            template = env.get_template("mail.html")
-        else:
-            # API request to get the template
-            pass
+        template = await get_template_registry().get_stored_template(
+            template_id
+        )
 
         data = {
             "title": subject,
             "text": text,
         }
-        output = template.render(**data)
+        try:
+            output = template.render(**data)
+        except SecurityError as err:
+            log.error(f"The template {template_id} is unsafe: {err}")
+            raise RejectedMessageError(f"Unsafe template: {err}") from err
         message.add_alternative(output, subtype="html")
 
         try:
-            await self._server.send_message(message)
+            await self.send_message(message)
         except aiosmtplib.errors.SMTPException as err:
             reason = f"{type(err).__name__}: {err}"
             log.error(f"An error while sending the letter: {reason}")
+            if is_recipient_refused(err):
+                raise RejectedMessageError(reason) from err
+            raise
         else:
             log.info(f"\nThe letter has been sent! \nEmail: {email}")
@@ -0,0 +1,135 @@
+import os
+import time
+from functools import lru_cache
+from uuid import UUID
+
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    Template,
+    TemplateNotFound,
+)
+from jinja2.sandbox import SandboxedEnvironment
+
+from core.config import config
+from core.logger import log
+from services.templates import get_templates_service
+
+DEFAULT_TEMPLATE = "mail.html"
+
+
+class TemplateRegistry:
+    """A class for work with the compiled email templates.
+
+    Each template is compiled once per process and recompiled
+    only when its file changes. The templates stored in the database
+    are kept compiled for `stored_ttl` seconds or until the templates
+    version in redis changes (checked every `version_interval` seconds).
+    The stored templates are written through the API, so they are
+    compiled in a sandboxed environment.
+    """
+
+    def __init__(
+        self,
+        templates_path: str = os.path.dirname(__file__),
+        cache_path: str | None = None,
+        auto_reload: bool = True,
+        stored_ttl: float = 60,
+        version_interval: float = 1,
+    ) -> None:
+        self._stored_ttl = stored_ttl
+        self._stored: dict[UUID, tuple[float, Template | None]] = {}
+        self._version_interval = version_interval
+        self._version: int | None = None
+        self._version_checked_at = 0.0
+
+        bytecode_cache = None
+        if cache_path:
+            os.makedirs(cache_path, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(cache_path)
+
+        self._environment = Environment(
+            loader=FileSystemLoader(templates_path),
+            bytecode_cache=bytecode_cache,
+            auto_reload=auto_reload,
+            cache_size=config.templates.cache_size,
+        )
+        self._sandboxed_environment = SandboxedEnvironment()
+
+    def get_template(self, template_id: UUID | None = None) -> Template:
+        """Gets the template by id (the default template if not found)."""
+
+        if template_id is None:
+            return self._environment.get_template(DEFAULT_TEMPLATE)
+
+        try:
+            return self._environment.get_template(f"{template_id}.html")
+        except TemplateNotFound:
+            log.debug(f"\nThe template {template_id} not found.")
+            return self._environment.get_template(DEFAULT_TEMPLATE)
+
+    async def check_version(self, now: float) -> None:
+        """Drops the stored templates if the templates version changed."""
+
+        if now - self._version_checked_at < self._version_interval:
+            return
+        self._version_checked_at = now
+
+        try:
+            version = await get_templates_service().get_version()
+        except Exception as err:
+            log.error(f"An error while getting the templates version: {err}")
+            return
+        if version != self._version:
+            self._stored.clear()
+            self._version = version
+
+    async def get_stored_template(
+        self, template_id: UUID | None = None
+    ) -> Template:
+        """Gets the template stored in the database by id.
+
+        The file templates are used if the template is not stored.
+        """
+
+        if template_id is None:
+            return self.get_template()
+
+        now = time.monotonic()
+        await self.check_version(now)
+        item = self._stored.get(template_id)
+        if item is None or item[0] < now:
+            try:
+                template_source = (
+                    await get_templates_service().get_template_source(
+                        template_id
+                    )
+                )
+            except Exception as err:
+                log.error(f"An error while getting the template: {err}")
+                return self.get_template(template_id)
+
+            template = None
+            if template_source is not None:
+                template = self._sandboxed_environment.from_string(
+                    template_source.body
+                )
+            item = (now + self._stored_ttl, template)
+            self._stored[template_id] = item
+
+        template = item[1]
+        if template is None:
+            return self.get_template(template_id)
+        return template
+
+
+@lru_cache()
+def get_template_registry() -> TemplateRegistry:
+    """TemplateRegistry provider (one registry per process)."""
+    return TemplateRegistry(
+        cache_path=config.templates.cache_path,
+        auto_reload=config.templates.auto_reload,
+        stored_ttl=config.templates.stored_ttl,
+        version_interval=config.templates.version_interval,
+    )
@@ -0,0 +1,89 @@
+import asyncio
+from contextlib import suppress
+from datetime import datetime
+from typing import Any, Awaitable, Callable
+from uuid import UUID
+
+from core.logger import log
+
+
+class SentTimeBuffer:
+    """A class for batching the notifications delivery timestamps.
+
+    The timestamps are flushed when `batch_size` of them are collected
+    and every `flush_interval` seconds. After `max_retries` failed
+    flushes in a row the timestamps are dropped.
+    """
+
+    def __init__(
+        self,
+        flush_func: Callable[[dict[UUID, datetime]], Awaitable[None]],
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_retries: int = 5,
+    ) -> None:
+        self._flush_func = flush_func
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_retries = max_retries
+        self._failures = 0
+        self._timestamps: dict[UUID, datetime] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flusher: asyncio.Task | None = None
+
+    async def __aenter__(self) -> "SentTimeBuffer":
+        self._flusher = asyncio.create_task(self.flush_periodically())
+        return self
+
+    async def __aexit__(
+        self, exc_type: Any, exc_val: Any, exc_tb: Any
+    ) -> None:
+        if self._flusher:
+            self._flusher.cancel()
+            # The cancelled flush restores its batch before the last flush
+            with suppress(asyncio.CancelledError):
+                await self._flusher
+        await self.flush()
+
+    async def add(self, notification_id: UUID, timestamp: datetime) -> None:
+        """Adds the delivery timestamp of the notification."""
+
+        self._timestamps[notification_id] = timestamp
+        if len(self._timestamps) >= self._batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Writes the collected timestamps with one request."""
+
+        async with self._flush_lock:
+            timestamps, self._timestamps = self._timestamps, {}
+            if not timestamps:
+                return
+            try:
+                await self._flush_func(timestamps)
+            except asyncio.CancelledError:
+                # The batch is flushed again (e.g. by the last flush)
+                self._timestamps = timestamps | self._timestamps
+                raise
+            except Exception as err:
+                log.error(f"SentTimeBuffer: An error while flushing: {err}")
+                self._failures += 1
+                if self._failures > self._max_retries:
+                    log.error(
+                        f"SentTimeBuffer: {len(timestamps)} timestamps "
+                        f"dropped after {self._failures} failed flushes."
+                    )
+                    self._failures = 0
+                    return
+                # Keep the newer timestamps collected during the flush
+                self._timestamps = timestamps | self._timestamps
+            else:
+                self._failures = 0
+                log.info(f"\nSentTimeBuffer: {len(timestamps)} flushed.\n")
+
+    async def flush_periodically(self) -> None:
+        """Flushes the timestamps every `flush_interval` seconds."""
+
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            await self.flush()
@@ -14,6 +14,12 @@ class TestConfig(BaseSettings):
     jwt_secret_key: str = Field(default="gPaFf9ldf-8lgUFePhe")
     jwt_algorithm: str = Field(default="HS256")
 
+    postgres_user: str = Field(default="postgres")
+    postgres_password: str = Field(default="secret")
+    postgres_db: str = Field(default="notifications_db")
+    postgres_host: str = Field(default="127.0.0.1")
+    postgres_port: int = Field(default=5432)
+
 
 config = TestConfig()
 
@@ -21,6 +27,11 @@ service_url = (
     f"{config.service_schema}{config.service_host}" f":{config.service_port}"
 )
 
+postgres_dsn = (
+    f"postgresql://{config.postgres_user}:{config.postgres_password}"
+    f"@{config.postgres_host}:{config.postgres_port}/{config.postgres_db}"
+)
+
 
 def get_auth_data():
     """Returns data for token encode."""
@@ -1,4 +1,5 @@
 from http import HTTPStatus
+from uuid import uuid4
 
 import aiohttp
 import pytest
@@ -67,6 +68,48 @@ from tools.token import create_cookies
             },
             HTTPStatus.OK,
         ),
+        (
+            {
+                "user_id": "f98e1eed-9516-4de2-bea1-30e552e48e5c",
+                "template_id": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
+                "subject": "Password reset",
+                "message": "Text",
+                "notification_type": "email",
+                "priority": "high",
+            },
+            HTTPStatus.OK,
+        ),
+        (
+            {
+                "user_id": "f98e1eed-9516-4de2-bea1-30e552e48e5c",
+                "template_id": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
+                "subject": "Title",
+                "message": "Text",
+                "notification_type": "email",
+                "priority": "urgent",
+            },
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+        ),
+        (
+            {
+                "user_id": "f98e1eed-9516-4de2-bea1-30e552e48e5c",
+                "template_id": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
+                "subject": "Title",
+                "message": "Text",
+                "send_at": "2100-01-01T09:00:00+03:00",
+            },
+            HTTPStatus.OK,
+        ),
+        (
+            {
+                "user_id": "f98e1eed-9516-4de2-bea1-30e552e48e5c",
+                "template_id": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
+                "subject": "Title",
+                "message": "Text",
+                "send_at": "tomorrow",
+            },
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+        ),
     ],
 )
 @pytest.mark.asyncio(loop_scope="session")
@@ -85,3 +128,70 @@ async def test_add_notification(
         log.debug(f"\nResponse: \n{response}.\n")
 
     assert status == api_return
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_add_notification_idempotency(
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    """Add notification with an idempotency key test."""
+
+    cookies = create_cookies()
+    headers = {"Idempotency-Key": str(uuid4())}
+    data_json = {
+        "user_id": "f98e1eed-9516-4de2-bea1-30e552e48e5c",
+        "template_id": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
+        "subject": "Title",
+        "message": "Text",
+    }
+
+    url = service_url + "/api/v1/notifications/"
+    notifications_ids = []
+    for _ in range(2):
+        async with aiohttp_session.post(
+            url, json=data_json, headers=headers, cookies=cookies
+        ) as response:
+            status = response.status
+            body = await response.json()
+            log.debug(f"\nResponse: \n{response}.\n")
+
+        assert status == HTTPStatus.OK
+        notifications_ids.append(body["id"])
+
+    assert notifications_ids[0] == notifications_ids[1]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_add_scheduled_notification(
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    """Add a scheduled notification and get it test."""
+
+    cookies = create_cookies()
+    data_json = {
+        "user_id": "f98e1eed-9516-4de2-bea1-30e552e48e5c",
+        "template_id": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
+        "subject": "Title",
+        "message": "Text",
+        "send_at": "2100-01-01T09:00:00+03:00",
+    }
+
+    url = service_url + "/api/v1/notifications/"
+    async with aiohttp_session.post(
+        url, json=data_json, cookies=cookies
+    ) as response:
+        status = response.status
+        body = await response.json()
+        log.debug(f"\nResponse: \n{response}.\n")
+
+    assert status == HTTPStatus.OK
+
+    url = service_url + f"/api/v1/notifications/{body['id']}"
+    async with aiohttp_session.get(url, cookies=cookies) as response:
+        status = response.status
+        notification = await response.json()
+
+    assert status == HTTPStatus.OK
+    # Stored as the naive UTC time, not released until then
+    assert notification["send_at"] == "2100-01-01T06:00:00"
+    assert notification["released_at"] is None
@@ -0,0 +1,72 @@
+from http import HTTPStatus
+
+import aiohttp
+import pytest
+
+from core.config import service_url
+from core.conftest import aiohttp_session
+from core.logger import log
+from tools.token import create_cookies
+
+NOTIFICATION = {
+    "user_id": "f98e1eed-9516-4de2-bea1-30e552e48e5c",
+    "template_id": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
+    "subject": "Title",
+    "message": "Text",
+    "notification_type": "email",
+}
+
+
+@pytest.mark.parametrize(
+    "data_json, api_return, quantity",
+    [
+        (
+            {"notifications": [NOTIFICATION] * 100},
+            HTTPStatus.OK,
+            100,
+        ),
+        (
+            {"notifications": [NOTIFICATION]},
+            HTTPStatus.OK,
+            1,
+        ),
+        (
+            {"notifications": []},
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+            None,
+        ),
+        (
+            {
+                "notifications": [
+                    NOTIFICATION,
+                    {
+                        "template_id": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
+                        "subject": "Title",
+                        "message": "Text",
+                    },
+                ]
+            },
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+            None,
+        ),
+    ],
+)
+@pytest.mark.asyncio(loop_scope="session")
+async def test_add_notifications_bulk(
+    aiohttp_session: aiohttp.ClientSession, data_json, api_return, quantity
+) -> None:
+    """Add notifications batch test."""
+
+    cookies = create_cookies()
+
+    url = service_url + "/api/v1/notifications/bulk"
+    async with aiohttp_session.post(
+        url, json=data_json, cookies=cookies
+    ) as response:
+        status = response.status
+        body = await response.json()
+        log.debug(f"\nResponse: \n{response}.\n")
+
+    assert status == api_return
+    if quantity is not None:
+        assert len(body) == quantity
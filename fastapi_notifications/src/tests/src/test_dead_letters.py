@@ -0,0 +1,58 @@
+from http import HTTPStatus
+
+import aiohttp
+import pytest
+
+from core.config import service_url
+from core.conftest import aiohttp_session
+from core.logger import log
+from tools.token import create_cookies
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_get_dead_letters(
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    """Get dead letter queues test."""
+
+    cookies = create_cookies()
+
+    url = service_url + "/api/v1/dead-letters/"
+    async with aiohttp_session.get(url, cookies=cookies) as response:
+        status = response.status
+        body = await response.json()
+        log.debug(f"\nResponse: \n{response}.\n")
+
+    assert status == HTTPStatus.OK
+    assert "created_tasks.prioritized" in [row["queue_name"] for row in body]
+
+
+@pytest.mark.parametrize(
+    "queue_name, params, api_return",
+    [
+        ("created_tasks.prioritized", {"limit": 10}, HTTPStatus.OK),
+        ("formed_tasks.email", {}, HTTPStatus.OK),
+        ("unknown_tasks", {}, HTTPStatus.NOT_FOUND),
+        (
+            "created_tasks.prioritized",
+            {"limit": 0},
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+        ),
+    ],
+)
+@pytest.mark.asyncio(loop_scope="session")
+async def test_replay_dead_letters(
+    aiohttp_session: aiohttp.ClientSession, queue_name, params, api_return
+) -> None:
+    """Replay dead letters test."""
+
+    cookies = create_cookies()
+
+    url = service_url + f"/api/v1/dead-letters/{queue_name}/replay"
+    async with aiohttp_session.post(
+        url, params=params, cookies=cookies
+    ) as response:
+        status = response.status
+        log.debug(f"\nResponse: \n{response}.\n")
+
+    assert status == api_return
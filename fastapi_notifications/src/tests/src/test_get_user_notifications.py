@@ -1,4 +1,6 @@
+from datetime import datetime
 from http import HTTPStatus
+from uuid import UUID, uuid4
 
 import aiohttp
 import pytest
@@ -44,3 +46,106 @@ async def test_get_notifications(
         log.info(f"\nResponse: \n{response}.\n")
 
     assert status == api_return
+
+
+@pytest.mark.parametrize(
+    "params, api_return",
+    [
+        ({"cursor": "invalid"}, HTTPStatus.BAD_REQUEST),
+        (
+            {"cursor": "invalid", "sort": "subject"},
+            HTTPStatus.BAD_REQUEST,
+        ),
+        ({"page_size": 1}, HTTPStatus.OK),
+    ],
+)
+@pytest.mark.asyncio(loop_scope="session")
+async def test_get_notifications_cursor_params(
+    aiohttp_session: aiohttp.ClientSession, params, api_return
+) -> None:
+    """Get user notifications by cursor parameters test."""
+
+    cookies = create_cookies()
+
+    url = (
+        service_url
+        + "/api/v1/notifications/user/f98e1eed-9516-4de2-bea1-30e552e48e5c"
+    )
+    async with aiohttp_session.get(
+        url, params=params, cookies=cookies
+    ) as response:
+        status = response.status
+        log.info(f"\nResponse: \n{response}.\n")
+
+    assert status == api_return
+
+
+def get_sort_keys(notifications: list[dict]) -> list[tuple[datetime, UUID]]:
+    """Gets the keyset pagination keys (created_at, id) of the page."""
+
+    return [
+        (datetime.fromisoformat(row["created_at"]), UUID(row["id"]))
+        for row in notifications
+    ]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_get_notifications_by_cursor(
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    """Get user notifications by cursor test."""
+
+    cookies = create_cookies()
+    user_id = str(uuid4())
+    page_size = 3
+
+    # More notifications than two pages of a new user
+    url = service_url + "/api/v1/notifications/bulk"
+    data_json = {
+        "notifications": [
+            {
+                "user_id": user_id,
+                "template_id": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
+                "subject": "Title",
+                "message": f"Text {i}",
+                "notification_type": "email",
+            }
+            for i in range(page_size * 2 + 1)
+        ]
+    }
+    async with aiohttp_session.post(
+        url, json=data_json, cookies=cookies
+    ) as response:
+        status = response.status
+
+    assert status == HTTPStatus.OK
+
+    url = service_url + f"/api/v1/notifications/user/{user_id}"
+    params = {"page_size": page_size}
+    async with aiohttp_session.get(
+        url, params=params, cookies=cookies
+    ) as response:
+        status = response.status
+        next_cursor = response.headers.get("X-Next-Cursor")
+        first_page = await response.json()
+        log.info(f"\nResponse: \n{response}.\n")
+
+    assert status == HTTPStatus.OK
+    assert next_cursor is not None
+    assert len(first_page) == page_size
+
+    async with aiohttp_session.get(
+        url, params=params | {"cursor": next_cursor}, cookies=cookies
+    ) as response:
+        status = response.status
+        next_page = await response.json()
+
+    assert status == HTTPStatus.OK
+    assert len(next_page) == page_size
+
+    first_ids = {row["id"] for row in first_page}
+    assert first_ids.isdisjoint(row["id"] for row in next_page)
+
+    # The default sort is "-created_at" (the id breaks the ties)
+    keys = get_sort_keys(first_page) + get_sort_keys(next_page)
+    assert keys == sorted(keys, reverse=True)
@@ -0,0 +1,90 @@
+from datetime import datetime
+from typing import Any, Iterator
+
+import psycopg
+import pytest
+
+from core.config import postgres_dsn
+from core.logger import log
+
+USER_ID = "f98e1eed-9516-4de2-bea1-30e552e48e5c"
+CURSOR = {
+    "created_at": datetime(2100, 1, 1),
+    "id": "ffffffff-ffff-ffff-ffff-ffffffffffff",
+}
+
+
+async def get_index_names(
+    connection: psycopg.AsyncConnection, index_name: str
+) -> list[str]:
+    """Gets the names of the index and its partitions indexes."""
+
+    cursor = await connection.execute(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = %(index_name)s",
+        {"index_name": index_name},
+    )
+    return [index_name] + [row[0] for row in await cursor.fetchall()]
+
+
+def get_plan_nodes(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """Gets the nodes of the query plan."""
+
+    yield plan
+    for subplan in plan.get("Plans", []):
+        yield from get_plan_nodes(subplan)
+
+
+@pytest.mark.parametrize(
+    "query, params, index_name",
+    [
+        (
+            "SELECT * FROM notifications WHERE user_id = %(user_id)s "
+            "ORDER BY created_at DESC, id DESC LIMIT 50 OFFSET 50",
+            {"user_id": USER_ID},
+            "ix_notifications_user_id_created_at",
+        ),
+        (
+            "SELECT * FROM notifications WHERE user_id = %(user_id)s "
+            "AND (created_at, id) < (%(created_at)s, %(id)s) "
+            "ORDER BY created_at DESC, id DESC LIMIT 50",
+            {"user_id": USER_ID} | CURSOR,
+            "ix_notifications_user_id_created_at",
+        ),
+        (
+            "SELECT * FROM notifications "
+            "WHERE (created_at, id) < (%(created_at)s, %(id)s) "
+            "ORDER BY created_at DESC, id DESC LIMIT 50",
+            CURSOR,
+            "ix_notifications_created_at",
+        ),
+        (
+            "SELECT * FROM notifications WHERE last_sent_at IS NULL "
+            "ORDER BY created_at, id LIMIT 50",
+            {},
+            "ix_notifications_unsent",
+        ),
+    ],
+)
+@pytest.mark.asyncio(loop_scope="session")
+async def test_listing_query_plans(query, params, index_name) -> None:
+    """The listing queries are read by the index without a sort test."""
+
+    async with await psycopg.AsyncConnection.connect(
+        postgres_dsn, cursor_factory=psycopg.AsyncClientCursor
+    ) as connection:
+        # The test table is small, the plan is checked as for a large one
+        await connection.execute("SET enable_seqscan = off")
+        cursor = await connection.execute(
+            f"EXPLAIN (FORMAT JSON) {query}", params
+        )
+        plan = (await cursor.fetchone())[0][0]["Plan"]
+        log.debug(f"\nPlan: \n{plan}.\n")
+        # The partitions are read by their own indexes
+        index_names = await get_index_names(connection, index_name)
+
+    nodes = list(get_plan_nodes(plan))
+    assert set(index_names) & {node.get("Index Name") for node in nodes}
+    assert "Sort" not in [node["Node Type"] for node in nodes]
@@ -0,0 +1,49 @@
+from datetime import datetime
+from http import HTTPStatus
+
+import aiohttp
+import psycopg
+import pytest
+
+from core.config import postgres_dsn, service_url
+from core.conftest import aiohttp_session
+from core.logger import log
+from tools.token import create_cookies
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_notification_partition(
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    """A notification is stored in the partition of its month test."""
+
+    cookies = create_cookies()
+    data_json = {
+        "user_id": "f98e1eed-9516-4de2-bea1-30e552e48e5c",
+        "template_id": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
+        "subject": "Title",
+        "message": "Text",
+    }
+
+    url = service_url + "/api/v1/notifications/"
+    async with aiohttp_session.post(
+        url, json=data_json, cookies=cookies
+    ) as response:
+        status = response.status
+        body = await response.json()
+        log.debug(f"\nResponse: \n{response}.\n")
+
+    assert status == HTTPStatus.OK
+
+    async with await psycopg.AsyncConnection.connect(
+        postgres_dsn
+    ) as connection:
+        cursor = await connection.execute(
+            "SELECT tableoid::regclass::text FROM notifications "
+            "WHERE id = %(id)s",
+            {"id": body["id"]},
+        )
+        partition_name = (await cursor.fetchone())[0]
+
+    created_at = datetime.fromisoformat(body["created_at"])
+    assert partition_name == f"notifications_p{created_at:%Y_%m}"
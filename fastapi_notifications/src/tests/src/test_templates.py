@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import aiohttp
+import pytest
+
+from core.config import service_url
+from core.conftest import aiohttp_session
+from core.logger import log
+from tools.token import USER_ID, create_cookies
+
+
+@pytest.mark.parametrize(
+    "data_json, api_return",
+    [
+        (
+            {
+                "name": "Title",
+                "body": "<h1>{{ title }}</h1><p>{{ text }}</p>",
+            },
+            HTTPStatus.OK,
+        ),
+        (
+            {
+                "name": "Title",
+            },
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+        ),
+    ],
+)
+@pytest.mark.asyncio(loop_scope="session")
+async def test_add_template(
+    aiohttp_session: aiohttp.ClientSession, data_json, api_return
+) -> None:
+    """Add template test."""
+
+    cookies = create_cookies()
+
+    url = service_url + "/api/v1/templates/"
+    async with aiohttp_session.post(
+        url, json=data_json, cookies=cookies
+    ) as response:
+        status = response.status
+        body = await response.json()
+        log.debug(f"\nResponse: \n{response}.\n")
+
+    assert status == api_return
+    if status != HTTPStatus.OK:
+        return
+
+    url = service_url + f"/api/v1/templates/{body['id']}"
+    async with aiohttp_session.get(url, cookies=cookies) as response:
+        status = response.status
+        template = await response.json()
+
+    assert status == HTTPStatus.OK
+    assert template["body"] == data_json["body"]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_add_template_not_admin(
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    """Add template by a non-admin user test."""
+
+    cookies = create_cookies({"sub": str(USER_ID), "acc": "user"})
+
+    url = service_url + "/api/v1/templates/"
+    async with aiohttp_session.post(
+        url, json={"name": "Title", "body": "{{ text }}"}, cookies=cookies
+    ) as response:
+        status = response.status
+        log.debug(f"\nResponse: \n{response}.\n")
+
+    assert status == HTTPStatus.FORBIDDEN
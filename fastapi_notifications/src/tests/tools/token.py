@@ -29,7 +29,7 @@ def create_access_token(
     return encoded_jwt
 
 
-def create_cookies() -> dict:
+def create_cookies(data: dict = USER_DATA) -> dict:
     """Create authorization cookies."""
-    access_token = create_access_token()
+    access_token = create_access_token(data=data)
     return {"users_access_token": access_token}